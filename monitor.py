@@ -29,6 +29,7 @@ import json
 import csv
 import time
 import signal
+import socket
 import threading
 import logging
 import gc
@@ -37,7 +38,7 @@ import re
 from collections import deque, defaultdict
 from statistics import mean, pstdev
 from datetime import datetime, timezone
-from typing import Dict, Optional, Tuple, List, Set
+from typing import Dict, Optional, Tuple, List, Set, Union
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -87,6 +88,7 @@ VOLUME_REFRESH_SEC    = 60  # New: Refresh volumes more frequently
 WS_PING_INTERVAL_SEC  = 30
 WS_RECONNECT_BASE_SEC = 1.0
 WS_RECONNECT_MAX_SEC  = 60.0
+WS_RCVBUF_BYTES       = 1 << 20  # socket receive buffer so tick bursts drain in fewer recv calls
 
 BASE_SPIKE_THRESHOLD  = 0.003
 BASE_Z_SCORE_MIN      = 0.8
@@ -762,10 +764,19 @@ def classify_game_phase(meta: dict, slug: str) -> str:
     return "UNKNOWN"
 
 
+# Characters dropped from formatted amount strings ("$1,234.56") in one pass
+_NUM_STRIP = str.maketrans("", "", ",$ \t\r\n")
+
+
 def extract_amount_value(obj) -> Optional[float]:
     """Extract numeric value from an Amount object ({value, currency}) or plain number/string."""
     if obj is None:
         return None
+    # Fast path: WS frames carry plain numbers / numeric strings in steady state
+    try:
+        return float(obj)
+    except (ValueError, TypeError):
+        pass
     if isinstance(obj, dict):
         v = obj.get("value") or obj.get("price")
         if v is not None:
@@ -776,17 +787,14 @@ def extract_amount_value(obj) -> Optional[float]:
         return None
     if isinstance(obj, str):
         # Handle formatted strings like "$1,234.56"
-        cleaned = obj.replace(",", "").replace("$", "").strip()
+        cleaned = obj.translate(_NUM_STRIP)
         if not cleaned:
             return None
         try:
             return float(cleaned)
         except (ValueError, TypeError):
             return None
-    try:
-        return float(obj)
-    except (ValueError, TypeError):
-        return None
+    return None
 
 
 def _safe_get(obj, key, default=None):
@@ -1330,11 +1338,11 @@ class MarketWebSocket:
         if new_slugs:
             logger.info(f"📡 Subscribed to {len(new_slugs)} new markets")
 
-    def _on_message(self, ws, raw_msg: str):
+    def _on_message(self, ws, raw_msg: Union[str, bytes]):
         STATE.ws_messages_total += 1
         try:
             msg = json.loads(raw_msg)
-        except json.JSONDecodeError:
+        except ValueError:  # JSONDecodeError, or UnicodeDecodeError on raw bytes
             return
 
         if not isinstance(msg, dict):
@@ -1505,9 +1513,13 @@ class MarketWebSocket:
                     on_error=self._on_error,
                     on_close=self._on_close,
                 )
+                # websocket-client already sets TCP_NODELAY; skip its pure-Python UTF-8
+                # check since json.loads validates the raw bytes anyway
                 self._ws.run_forever(
                     ping_interval=WS_PING_INTERVAL_SEC,
                     ping_timeout=10,
+                    skip_utf8_validation=True,
+                    sockopt=((socket.SOL_SOCKET, socket.SO_RCVBUF, WS_RCVBUF_BYTES),),
                 )
             except Exception as e:
                 logger.error(f"WS run error: {e}")
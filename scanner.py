@@ -22,13 +22,20 @@ import sys
 import json
 import time
 import signal
+import atexit
 import threading
+import queue
 import base64
+import binascii
 import re
+import socket
+import math
+from bisect import bisect_right
 from collections import deque
-from statistics import mean, pstdev
-from datetime import datetime, timezone
-from typing import Dict, Optional, List, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, List, Set, Tuple, Union
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -46,19 +53,48 @@ try:
 except ImportError:
     HAS_WINSOUND = False
 
+# Optional faster JSON for the WS tick path (pip install orjson); stdlib fallback
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
 # -------------------- Console + Log File --------------------
-_log_file = open("scanner-console-log.txt", "w", encoding="utf-8")
+_log_file = open("scanner-console-log.txt", "w", encoding="utf-8", buffering=1 << 16)
 _print_lock = threading.Lock()
+LOG_FLUSH_INTERVAL_SEC = 1.0   # log file is flushed by a background thread, not per line
 
 def tee_print(*args, **kwargs):
-    """Print to both console and log file."""
+    """Print to both console and log file.
+
+    The log is buffered and flushed by _log_flusher; pass flush=True for
+    lines (errors) that must reach disk immediately.
+    """
     with _print_lock:
         print(*args, **kwargs)
         kwargs.pop("file", None)
         print(*args, file=_log_file, **kwargs)
-        _log_file.flush()
+
+def flush_log():
+    with _print_lock:
+        try:
+            _log_file.flush()
+        except ValueError:
+            pass  # already closed at interpreter exit
+
+def _log_flusher():
+    while not STOP.wait(LOG_FLUSH_INTERVAL_SEC):
+        flush_log()
+
+atexit.register(flush_log)
 
 # -------------------- Configuration --------------------
 POLYMARKET_KEY_ID = os.getenv("POLYMARKET_KEY_ID", "")
@@ -121,21 +157,48 @@ WEIGHT_TREND_TIGHT = 0.20      # spread < 10% (wider than FADE)
 
 # Infrastructure
 MAX_MARKETS = 1500
+DISCOVERY_PAGE_SIZE = 100
+DISCOVERY_WORKERS = 5          # concurrent page fetches per wave (matches REST pool size)
 MARKET_REFRESH_SEC = 300
+MARKET_REFRESH_MIN_SEC = 60    # floor between refreshes when triggered early by an unknown slug
+PHASE_CACHE_TTL_SEC = 60       # reuse a market's game-phase classification this long
+MARKET_STALE_SEC = 3600        # drop tracker state for markets with no tick in this long
+MARKET_EVICT_EVERY_SEC = 300   # how often get_metrics sweeps for stale markets
 WS_PING_INTERVAL_SEC = 30
 WS_RECONNECT_BASE_SEC = 1.0
 WS_RECONNECT_MAX_SEC = 60.0
+WS_QUEUE_MAXSIZE = 10_000      # bounded raw-frame hand-off between WS reader and worker
+WS_COALESCE_FRAC = 0.80        # backlog above this fraction -> keep only latest tick per slug
+WS_BATCH_MAX = 256             # max frames drained per worker pass
+WS_SUBSCRIBE_RATE = 20.0       # subscribe frames/sec sustained (the old 50ms pacing)...
+WS_SUBSCRIBE_BURST = 20        # ...but this many go out back-to-back before pacing kicks in
+WS_SNDBUF_BYTES = 1 << 20      # socket send buffer so subscribe bursts don't block on the wire
+WS_RCVBUF_BYTES = 1 << 20      # socket receive buffer so tick bursts drain in fewer recv calls
+DASHBOARD_QUEUE_MAXSIZE = 2    # pending renders for the printer thread; extras are dropped
+WS_CPU_CORES = {2}             # Linux only: pin WS reader + worker here (ignored if core absent)
+AUX_CPU_CORES = {3}            # Linux only: pin dashboard + refresh threads here
+WS_THREAD_NICE = -5            # priority boost for WS threads (needs CAP_SYS_NICE; else ignored)
 
 STOP = threading.Event()
+REFRESH_EVENT = threading.Event()  # set by the WS reader on a slug missing from MARKET_META
 
 # Module-level market metadata (timing info from REST discovery)
 MARKET_META: Dict[str, dict] = {}
 
 # -------------------- Helpers --------------------
 
+# Characters dropped from formatted amount strings ("$1,234.56") in one pass
+_NUM_STRIP = str.maketrans("", "", ",$ \t\r\n")
+
+
 def extract_amount_value(obj) -> Optional[float]:
     if obj is None:
         return None
+    # Fast path: plain numbers / numeric strings (steady-state WS frames)
+    try:
+        return float(obj)
+    except (ValueError, TypeError):
+        pass
     if isinstance(obj, dict):
         v = obj.get("value") or obj.get("price")
         if v is not None:
@@ -145,22 +208,22 @@ def extract_amount_value(obj) -> Optional[float]:
                 return None
         return None
     if isinstance(obj, str):
-        cleaned = obj.replace(",", "").replace("$", "").strip()
+        cleaned = obj.translate(_NUM_STRIP)
         if not cleaned:
             return None
         try:
             return float(cleaned)
         except (ValueError, TypeError):
             return None
-    try:
-        return float(obj)
-    except (ValueError, TypeError):
-        return None
+    return None
+
+
+# Match YYYY-MM-DD at end or followed by -outcome suffix (MLS three-way markets)
+_SLUG_DATE_RE = re.compile(r'(\d{4}-\d{2}-\d{2})(?:-[a-z]+)?$')
 
 
 def parse_date_from_slug(slug: str) -> Optional[datetime]:
-    # Match YYYY-MM-DD at end or followed by -outcome suffix (MLS three-way markets)
-    match = re.search(r'(\d{4}-\d{2}-\d{2})(?:-[a-z]+)?$', slug)
+    match = _SLUG_DATE_RE.search(slug)
     if match:
         try:
             return datetime.strptime(match.group(1), "%Y-%m-%d").replace(tzinfo=timezone.utc)
@@ -169,19 +232,25 @@ def parse_date_from_slug(slug: str) -> Optional[datetime]:
     return None
 
 
-def classify_game_phase(meta: dict, slug: str) -> str:
-    """Classify game phase: PRE_GAME, LIVE, POST_GAME, or UNKNOWN.
-
-    Slug date takes priority for cross-day checks (API startDate is market
-    creation time, not game time). API end_date used for same-day refinement.
-    """
-    from datetime import timedelta
+def phase_clock() -> Tuple[datetime, datetime, datetime]:
+    """(today_start, tomorrow_start, now_utc) for classify_game_phase; take once per scan."""
     # Use local date (not UTC) — slug dates are US local dates.
     # After ~7 PM ET (midnight UTC), UTC rolls to next day, which would
     # incorrectly filter tonight's live games as "yesterday/stale".
     now_local = datetime.now()
     today_start = now_local.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
-    tomorrow_start = today_start + timedelta(days=1)
+    return today_start, today_start + timedelta(days=1), datetime.now(timezone.utc)
+
+
+def classify_game_phase(meta: dict, slug: str,
+                        clock: Optional[Tuple[datetime, datetime, datetime]] = None) -> str:
+    """Classify game phase: PRE_GAME, LIVE, POST_GAME, or UNKNOWN.
+
+    Slug date takes priority for cross-day checks (API startDate is market
+    creation time, not game time). API end_date used for same-day refinement.
+    Pass a phase_clock() snapshot when classifying many markets in one pass.
+    """
+    today_start, tomorrow_start, now_utc = clock or phase_clock()
 
     # Step 1: Slug date for coarse classification
     game_date = parse_date_from_slug(slug)
@@ -198,7 +267,7 @@ def classify_game_phase(meta: dict, slug: str) -> str:
             end_dt = datetime.fromisoformat(end_str.replace("Z", "+00:00"))
             if end_dt.tzinfo is None:
                 end_dt = end_dt.replace(tzinfo=timezone.utc)
-            if datetime.now(timezone.utc) > end_dt:
+            if now_utc > end_dt:
                 return "POST_GAME"
         except (ValueError, TypeError):
             pass
@@ -209,27 +278,128 @@ def classify_game_phase(meta: dict, slug: str) -> str:
     return "UNKNOWN"
 
 
-def score_linear(value: float, brackets: List[Tuple[float, float]]) -> float:
-    if value <= brackets[0][0]:
-        return brackets[0][1]
-    if value >= brackets[-1][0]:
-        return brackets[-1][1]
-    for i in range(len(brackets) - 1):
-        lo_val, lo_score = brackets[i]
-        hi_val, hi_score = brackets[i + 1]
-        if lo_val <= value <= hi_val:
-            t = (value - lo_val) / (hi_val - lo_val) if hi_val != lo_val else 0
-            return lo_score + t * (hi_score - lo_score)
-    return brackets[-1][1]
+# slug -> (computed_at, phase); phase only moves at day boundaries / end_date
+_PHASE_CACHE: Dict[str, Tuple[float, str]] = {}
+
+
+def cached_game_phase(slug: str, now: float,
+                      clock: Optional[Tuple[datetime, datetime, datetime]] = None) -> str:
+    """classify_game_phase for a tracked market, reused for PHASE_CACHE_TTL_SEC."""
+    cached = _PHASE_CACHE.get(slug)
+    if cached is not None and now - cached[0] < PHASE_CACHE_TTL_SEC:
+        return cached[1]
+    phase = classify_game_phase(MARKET_META.get(slug, {}), slug, clock)
+    _PHASE_CACHE[slug] = (now, phase)
+    return phase
+
+
+def make_brackets(points: List[Tuple[float, float]]) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """Split (value, score) knots into parallel xs / ys tuples for score_linear."""
+    return tuple(p[0] for p in points), tuple(p[1] for p in points)
+
+
+def score_linear(value: float, brackets: Tuple[Tuple[float, ...], Tuple[float, ...]]) -> float:
+    """Piecewise-linear score of value over prebuilt (xs, ys) knots."""
+    xs, ys = brackets
+    i = bisect_right(xs, value)
+    if i == 0:
+        return ys[0]
+    if i == len(xs):
+        return ys[-1]
+    lo_val = xs[i - 1]
+    hi_val = xs[i]
+    return ys[i - 1] + (value - lo_val) * (ys[i] - ys[i - 1]) / (hi_val - lo_val)
+
+
+# Score curves (value -> 0..100), built once at import
+READY_BRACKETS = make_brackets([
+    (0, 0), (1, 35), (2, 60), (3, 80), (5, 95), (8, 100),
+])
+REVERSION_BRACKETS = make_brackets([
+    (0, 0), (15, 15), (30, 40), (50, 70), (70, 95), (100, 100),
+])
+# Continuation score: 0% = 0, 40% = 50, 60% = 75, 80%+ = 100
+CONTINUATION_BRACKETS = make_brackets([
+    (0, 0), (20, 20), (40, 50), (60, 75), (80, 95), (100, 100),
+])
+VOLATILE_BRACKETS = make_brackets([
+    (0, 0), (2, 15), (5, 35), (10, 55), (20, 80), (30, 100),
+])
+TIGHT_BRACKETS = make_brackets([
+    (0, 0), (3, 20), (8, 45), (15, 70), (25, 90), (40, 100),
+])
+
+
+def rolling_z(x: float, sum_x: float, sum_x2: float, n: int) -> Tuple[Optional[float], float]:
+    """(z, mean) of x against a window given its running sums; z is None for a flat window."""
+    m_val = sum_x / n
+    var = sum_x2 / n - m_val * m_val
+    if var <= 1e-18:  # stdev <= 1e-9
+        return None, m_val
+    return (x - m_val) / math.sqrt(var), m_val
+
+
+def sign_request(private_key: ed25519.Ed25519PrivateKey, method: str, path: str, ts: str) -> str:
+    """Base64 Ed25519 signature over ts+method+path (binascii: no base64 module wrapper)."""
+    sig = private_key.sign(f"{ts}{method}{path}".encode("utf-8"))
+    return binascii.b2a_base64(sig, newline=False).decode("ascii")
+
+
+SCORE_BAR_WIDTH = 24
+# Every possible bar for the default width, indexed by filled cell count
+_BAR_LUT = tuple("[" + "|" * n + "." * (SCORE_BAR_WIDTH - n) + "]"
+                 for n in range(SCORE_BAR_WIDTH + 1))
+
+
+def tune_current_thread(cores: Set[int], nice: int = 0):
+    """Best-effort pin/prioritise the calling thread. Linux-only; silently a no-op elsewhere."""
+    if not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        usable = cores & os.sched_getaffinity(0)
+        if usable:
+            os.sched_setaffinity(0, usable)  # pid 0 = calling thread on Linux
+    except OSError:
+        pass
+    if nice:
+        try:
+            os.nice(nice)  # per-thread on Linux (NPTL)
+        except OSError:
+            pass
+
+
+def format_spike_line(slug: str, z: float, mid: float, spread: float, tag: str) -> str:
+    """Dashboard line for a spike, minus the age suffix (formatted once at record time)."""
+    display_slug = slug[:30] if len(slug) > 30 else slug
+    direction = "SPIKE" if z > 0 else "DIP"
+    tag_str = f" [{tag}]" if tag else ""
+    return (f"    {display_slug:<31} z={z:+.1f} {direction:<5} mid={mid:.3f} "
+            f"spread={spread*100:.1f}%{tag_str}")
 
 
-def score_bar(score: float, width: int = 24) -> str:
-    filled = int(score / 100 * width)
+def score_bar(score: float, width: int = SCORE_BAR_WIDTH) -> str:
+    filled = max(0, min(width, int(score / 100 * width)))
+    if width == SCORE_BAR_WIDTH:
+        return _BAR_LUT[filled]
     return "[" + "|" * filled + "." * (width - filled) + "]"
 
 
 # -------------------- REST Client --------------------
 
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter with TCP_NODELAY + SO_KEEPALIVE on pooled sockets so the
+    discovery connection survives between refreshes instead of re-handshaking."""
+
+    _SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self._SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
 class RestClient:
     def __init__(self, key_id: str, secret_key: str):
         self.key_id = key_id
@@ -237,14 +407,13 @@ class RestClient:
         self._private_key = ed25519.Ed25519PrivateKey.from_private_bytes(key_bytes[:32])
         self._session = requests.Session()
         retries = Retry(total=3, backoff_factor=1.0, status_forcelist=[429, 500, 502, 503, 504])
-        adapter = HTTPAdapter(max_retries=retries, pool_connections=5, pool_maxsize=5)
+        adapter = _KeepAliveAdapter(max_retries=retries, pool_connections=5,
+                                    pool_maxsize=DISCOVERY_WORKERS)
         self._session.mount("https://", adapter)
         self._session.headers.update({"User-Agent": "PolymarketScanner/4.0", "Accept": "application/json"})
 
     def _sign(self, method: str, path: str, timestamp_ms: str) -> str:
-        message = f"{timestamp_ms}{method}{path}"
-        sig = self._private_key.sign(message.encode("utf-8"))
-        return base64.b64encode(sig).decode("utf-8")
+        return sign_request(self._private_key, method, path, timestamp_ms)
 
     def _get_headers(self, method: str, path: str) -> dict:
         ts = str(int(time.time() * 1000))
@@ -262,30 +431,38 @@ class RestClient:
             if resp.status_code == 200:
                 return resp.json()
         except Exception as e:
-            tee_print(f"  API error {path}: {e}")
+            tee_print(f"  API error {path}: {e}", flush=True)
         return None
 
+    def _get_page(self, offset: int) -> list:
+        data = self._get("/v1/markets", {
+            "limit": str(DISCOVERY_PAGE_SIZE), "offset": str(offset),
+            "active": "true", "closed": "false",
+        })
+        if isinstance(data, dict):
+            return data.get("markets", data.get("data", [])) or []
+        if isinstance(data, list):
+            return data
+        return []
+
     def discover_markets(self) -> List[str]:
+        # Pages are fetched in concurrent waves over the pooled connections; the
+        # first short/empty page (in offset order) ends discovery. At most one
+        # wave of requests past the end is wasted.
         all_markets = []
         offset = 0
-        page_size = 100
-        while len(all_markets) < MAX_MARKETS:
-            data = self._get("/v1/markets", {
-                "limit": str(page_size), "offset": str(offset),
-                "active": "true", "closed": "false",
-            })
-            page = []
-            if isinstance(data, dict):
-                page = data.get("markets", data.get("data", []))
-            elif isinstance(data, list):
-                page = data
-            if not page:
-                break
-            all_markets.extend(page)
-            offset += len(page)
-            if len(page) < page_size:
-                break
-            time.sleep(0.1)
+        with ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS) as pool:
+            done = False
+            while not done and len(all_markets) < MAX_MARKETS:
+                remaining = MAX_MARKETS - len(all_markets)
+                n_pages = min(DISCOVERY_WORKERS, -(-remaining // DISCOVERY_PAGE_SIZE))
+                offsets = [offset + i * DISCOVERY_PAGE_SIZE for i in range(n_pages)]
+                for page in pool.map(self._get_page, offsets):
+                    all_markets.extend(page)
+                    if len(page) < DISCOVERY_PAGE_SIZE:
+                        done = True
+                        break
+                offset += n_pages * DISCOVERY_PAGE_SIZE
 
         # Use local date (not UTC) — slug dates are US local dates.
         # After ~7 PM ET (midnight UTC), UTC rolls to next day, which would
@@ -341,20 +518,44 @@ class SpikeRecord:
 # -------------------- Market Z-Score Tracker --------------------
 
 class MarketState:
-    __slots__ = ('history', 'last_mid', 'last_bid', 'last_ask', 'last_spread',
-                 'last_oi', 'peak_z', 'peak_z_time', 'last_update')
+    __slots__ = ('history', 'sum_x', 'sum_x2', 'n_since_resync',
+                 'last_mid', 'last_bid', 'last_ask', 'last_spread',
+                 'last_oi', 'peak_z', 'abs_peak_z', 'peak_z_time', 'last_update')
 
     def __init__(self):
         self.history: deque = deque(maxlen=HISTORY_LEN)
+        # Running sums over history for O(1) mean/variance
+        self.sum_x: float = 0.0
+        self.sum_x2: float = 0.0
+        self.n_since_resync: int = 0
         self.last_mid: float = 0.0
         self.last_bid: float = 0.0
         self.last_ask: float = 0.0
         self.last_spread: float = 999.0
         self.last_oi: float = 0.0
         self.peak_z: float = 0.0
+        self.abs_peak_z: float = 0.0  # abs(peak_z), kept alongside so readers skip abs()
         self.peak_z_time: float = 0.0
         self.last_update: float = 0.0
 
+    def push(self, x: float):
+        """Append to history, keeping the running sums in step with the window."""
+        hist = self.history
+        if len(hist) == HISTORY_LEN:
+            old = hist[0]
+            self.sum_x -= old
+            self.sum_x2 -= old * old
+        hist.append(x)
+        self.n_since_resync += 1
+        if self.n_since_resync >= HISTORY_LEN:
+            # Recompute exactly once per full window so add/subtract rounding can't drift
+            self.sum_x = math.fsum(hist)
+            self.sum_x2 = math.fsum(v * v for v in hist)
+            self.n_since_resync = 0
+        else:
+            self.sum_x += x
+            self.sum_x2 += x * x
+
 
 class ActivityTracker:
     """Runs a mini z-score pipeline + reversion tracking."""
@@ -362,11 +563,19 @@ class ActivityTracker:
     def __init__(self):
         self._lock = threading.Lock()
         self._markets: Dict[str, MarketState] = {}
-        # Recent FADE-eligible spikes (for dashboard display)
+        # Recent FADE-eligible spikes as (time, preformatted line) for dashboard display
         self._recent_spikes: deque = deque(maxlen=50)
         # Spike reversion tracking
         self._spike_records: deque = deque(maxlen=200)
+        # Unchecked records in creation (= time) order, so due ones are always at the left
+        self._pending_records: deque = deque(maxlen=200)
         self._update_count = 0
+        self._last_evict = time.time()
+        # Last get_metrics result, reusable until a tick arrives (_dirty) or a
+        # time window it depends on rolls over (_cached_until)
+        self._dirty = True
+        self._cached_metrics: Optional[dict] = None
+        self._cached_until = 0.0
 
     def record_update(self, slug: str, bid: float, ask: float, oi: float):
         now = time.time()
@@ -378,6 +587,7 @@ class ActivityTracker:
 
         with self._lock:
             self._update_count += 1
+            self._dirty = True
             ms = self._markets.get(slug)
             if ms is None:
                 ms = MarketState()
@@ -393,19 +603,18 @@ class ActivityTracker:
             ms.last_mid = mid
 
             if prev_mid > 0:
-                ms.history.append(mid)
-
-                if len(ms.history) >= MIN_WARMUP:
-                    h = list(ms.history)
-                    m_val = mean(h)
-                    s_val = pstdev(h, m_val)
-                    if s_val > 1e-9:
-                        z = (mid - m_val) / s_val
+                ms.push(mid)
+
+                n = len(ms.history)
+                if n >= MIN_WARMUP:
+                    z, m_val = rolling_z(mid, ms.sum_x, ms.sum_x2, n)
+                    if z is not None:
                         abs_z = abs(z)
 
                         # Track peak z for this market (decays after 60s)
-                        if abs_z > abs(ms.peak_z) or (now - ms.peak_z_time > 60):
+                        if abs_z > ms.abs_peak_z or (now - ms.peak_z_time > 60):
                             ms.peak_z = z
+                            ms.abs_peak_z = abs_z
                             ms.peak_z_time = now
 
                         # Eligibility checks
@@ -427,28 +636,29 @@ class ActivityTracker:
                                 tag = "F"
                             else:
                                 tag = "T"
-                            self._recent_spikes.append((now, slug, z, mid, spread_pct, tag))
+                            self._recent_spikes.append(
+                                (now, format_spike_line(slug, z, mid, spread_pct, tag)))
                             # Create reversion/continuation record
-                            self._spike_records.append(SpikeRecord(
+                            rec = SpikeRecord(
                                 t=now, slug=slug, spike_mid=mid,
                                 pre_mean=m_val, z_score=z, spread=spread_pct,
                                 fade_eligible=is_fade, trend_eligible=is_trend,
-                            ))
+                            )
+                            self._spike_records.append(rec)
+                            self._pending_records.append(rec)
 
                         # Also log wider spikes for display only (FADE z-range, spread 4-10%)
                         elif is_fade_z and mid_ok and spread_pct < MAX_SPREAD_BASE:
-                            self._recent_spikes.append((now, slug, z, mid, spread_pct, ""))
+                            self._recent_spikes.append(
+                                (now, format_spike_line(slug, z, mid, spread_pct, "")))
             else:
-                ms.history.append(mid)
+                ms.push(mid)
 
     def _check_reversions(self, now: float):
         """Check old spike records to see if price reverted. Called under lock."""
-        for rec in self._spike_records:
-            if rec.checked:
-                continue
-            age = now - rec.time
-            if age < REVERSION_CHECK_SEC:
-                continue  # too soon to check
+        pending = self._pending_records
+        while pending and now - pending[0].time >= REVERSION_CHECK_SEC:
+            rec = pending.popleft()
             # Check current mid for this market
             ms = self._markets.get(rec.slug)
             if ms is None or ms.last_mid <= 0:
@@ -476,114 +686,158 @@ class ActivityTracker:
             rec.reverted = reversion_pct >= REVERSION_THRESHOLD
             rec.continued = reversion_pct < CONTINUATION_THRESHOLD
 
+    def _evict_stale(self, now: float):
+        """Forget markets that stopped ticking so the scan tracks today's set. Called under lock."""
+        cutoff = now - MARKET_STALE_SEC
+        stale = [slug for slug, ms in self._markets.items() if ms.last_update < cutoff]
+        for slug in stale:
+            del self._markets[slug]
+            _PHASE_CACHE.pop(slug, None)
+
     def get_metrics(self) -> dict:
         now = time.time()
         spike_window = 300  # 5-min window for recent spikes
 
+        # Hold the lock only long enough to snapshot scalar state; the scan,
+        # phase classification and rate maths run without blocking the WS worker.
         with self._lock:
+            if not self._dirty and self._cached_metrics is not None and now < self._cached_until:
+                return self._cached_metrics
+            self._dirty = False
+
             # Check any pending reversion records
             self._check_reversions(now)
+            if now - self._last_evict >= MARKET_EVICT_EVERY_SEC:
+                self._last_evict = now
+                self._evict_stale(now)
+
+            market_snap = [
+                (slug, ms.last_oi, len(ms.history), ms.last_spread,
+                 ms.last_mid, ms.abs_peak_z, ms.peak_z_time)
+                for slug, ms in self._markets.items()
+            ]
+
+            # Reversion / continuation tallies over the rolling window in one pass.
+            # Records are in time order, so walk newest-first and stop at the cutoff.
+            total_checked = total_reverted = fade_pending = 0
+            trend_total_checked = trend_total_continued = trend_pending = 0
+            record_cutoff = now - REVERSION_WINDOW_SEC
+            # Earliest moment any windowed count below can change without a new tick
+            valid_until = self._last_evict + MARKET_EVICT_EVERY_SEC
+            if self._pending_records:
+                valid_until = min(valid_until, self._pending_records[0].time + REVERSION_CHECK_SEC)
+            for r in reversed(self._spike_records):
+                if r.time <= record_cutoff:
+                    break
+                valid_until = min(valid_until, r.time + REVERSION_WINDOW_SEC)
+                if r.fade_eligible:
+                    if r.checked:
+                        total_checked += 1
+                        total_reverted += r.reverted
+                    else:
+                        fade_pending += 1
+                if r.trend_eligible:
+                    if r.checked:
+                        trend_total_checked += 1
+                        trend_total_continued += r.continued
+                    else:
+                        trend_pending += 1
+
+            # Recent spikes for display (last 5 min, most recent first).
+            # _recent_spikes is appended in time order, so walk it newest-first
+            # and stop at the first entry outside the window — no filter + sort.
+            # Only the top few are copied out; the rest are just counted.
+            recent_shown = []
+            recent_spike_count = 0
+            for item in reversed(self._recent_spikes):
+                if now - item[0] >= spike_window:
+                    break
+                valid_until = min(valid_until, item[0] + spike_window)
+                if recent_spike_count < TOP_SPIKES_SHOWN:
+                    recent_shown.append(item)
+                recent_spike_count += 1
+            update_count = self._update_count
+
+        total_markets = len(market_snap)
+        warmed_up = 0
+        ready = 0
+        volatile = 0
+        fade_ready = 0     # FADE-eligible: z 3.5-6, spread < 4%, mid in range
+        trend_ready = 0    # TREND-eligible: z >= 3.5, spread < 10%, mid in range
+        tight_entry = 0
+        trend_tight = 0    # spread < 10% (TREND threshold)
+        total_oi = 0.0
+        # Game phase counts for strategy-ready markets
+        fade_phase_live = 0
+        fade_phase_pre = 0
+        fade_phase_unknown = 0
+        trend_phase_live = 0
+        trend_phase_pre = 0
+        trend_phase_unknown = 0
+
+        peak_cutoff = now - 60  # peak z counts only if set within the last 60s
+        clock = phase_clock()   # shared by every phase classification in this scan
+        for slug, last_oi, n_hist, last_spread, last_mid, abs_z, peak_z_time in market_snap:
+            total_oi += last_oi
+
+            if last_spread < MAX_SPREAD_FADE:
+                tight_entry += 1
+            if last_spread < MAX_SPREAD_TREND:
+                trend_tight += 1
+
+            if n_hist < MIN_WARMUP:
+                continue
+            warmed_up += 1
+            if last_spread < MAX_SPREAD_BASE:
+                ready += 1
 
-            total_markets = len(self._markets)
-            warmed_up = 0
-            ready = 0
-            volatile = 0
-            fade_ready = 0     # FADE-eligible: z 3.5-6, spread < 4%, mid in range
-            trend_ready = 0    # TREND-eligible: z >= 3.5, spread < 10%, mid in range
-            tight_entry = 0
-            trend_tight = 0    # spread < 10% (TREND threshold)
-            total_oi = 0.0
-            # Game phase counts for strategy-ready markets
-            fade_phase_live = 0
-            fade_phase_pre = 0
-            fade_phase_unknown = 0
-            trend_phase_live = 0
-            trend_phase_pre = 0
-            trend_phase_unknown = 0
-
-            for slug, ms in self._markets.items():
-                total_oi += ms.last_oi
-                n_hist = len(ms.history)
-
-                if n_hist >= MIN_WARMUP:
-                    warmed_up += 1
-                    if ms.last_spread < MAX_SPREAD_BASE:
-                        ready += 1
-
-                if ms.last_spread < MAX_SPREAD_FADE:
-                    tight_entry += 1
-                if ms.last_spread < MAX_SPREAD_TREND:
-                    trend_tight += 1
-
-                # Check peak z within the last 60s
-                if now - ms.peak_z_time < 60 and n_hist >= MIN_WARMUP:
-                    abs_z = abs(ms.peak_z)
-                    mid_ok = MIN_MID <= ms.last_mid <= MAX_MID
-                    if abs_z >= Z_WATCH:
-                        volatile += 1
-                    # FADE-ready: z in FADE range, tight spread, mid ok
-                    if (Z_TRADEABLE <= abs_z < Z_MAX_FADE
-                            and mid_ok and ms.last_spread < MAX_SPREAD_FADE):
-                        fade_ready += 1
-                        meta = MARKET_META.get(slug, {})
-                        phase = classify_game_phase(meta, slug)
-                        if phase == "LIVE":
-                            fade_phase_live += 1
-                        elif phase == "PRE_GAME":
-                            fade_phase_pre += 1
-                        else:
-                            fade_phase_unknown += 1
-                    # TREND-ready: z >= 3.5 (no upper cap), wider spread OK, mid ok
-                    if (abs_z >= Z_MIN_TREND
-                            and mid_ok and ms.last_spread < MAX_SPREAD_TREND):
-                        trend_ready += 1
-                        meta = MARKET_META.get(slug, {})
-                        phase = classify_game_phase(meta, slug)
-                        if phase == "LIVE":
-                            trend_phase_live += 1
-                        elif phase == "PRE_GAME":
-                            trend_phase_pre += 1
-                        else:
-                            trend_phase_unknown += 1
-
-            # Reversion rate from recent checked FADE-eligible spikes
-            recent_records = [r for r in self._spike_records if now - r.time < REVERSION_WINDOW_SEC]
-            fade_checked = [r for r in recent_records if r.checked and r.fade_eligible]
-            fade_reverted = [r for r in fade_checked if r.reverted]
-            total_checked = len(fade_checked)
-            total_reverted = len(fade_reverted)
-            reversion_rate = total_reverted / total_checked if total_checked > 0 else 0.0
-            fade_pending = len([r for r in recent_records if not r.checked and r.fade_eligible])
-
-            # Continuation rate from recent checked TREND-eligible spikes
-            trend_checked = [r for r in recent_records if r.checked and r.trend_eligible]
-            trend_continued = [r for r in trend_checked if r.continued]
-            trend_total_checked = len(trend_checked)
-            trend_total_continued = len(trend_continued)
-            continuation_rate = trend_total_continued / trend_total_checked if trend_total_checked > 0 else 0.0
-            trend_pending = len([r for r in recent_records if not r.checked and r.trend_eligible])
-
-            # Recent spikes for display (last 5 min, most recent first)
-            recent_list = [item for item in self._recent_spikes if now - item[0] < spike_window]
-            recent_list.sort(key=lambda x: x[0], reverse=True)
-            recent_spike_count = len(recent_list)
+            # Check peak z within the last 60s
+            if peak_z_time <= peak_cutoff:
+                continue
+            valid_until = min(valid_until, peak_z_time + 60)
+            if abs_z < Z_WATCH:
+                continue  # below every strategy threshold
+            volatile += 1
+            if not (MIN_MID <= last_mid <= MAX_MID) or last_spread >= MAX_SPREAD_TREND:
+                continue
+
+            # FADE-ready: z in FADE range, tight spread, mid ok
+            is_fade = Z_TRADEABLE <= abs_z < Z_MAX_FADE and last_spread < MAX_SPREAD_FADE
+            # TREND-ready: z >= 3.5 (no upper cap), wider spread OK, mid ok
+            is_trend = abs_z >= Z_MIN_TREND
+            if not (is_fade or is_trend):
+                continue
+            phase = cached_game_phase(slug, now, clock)  # once per market, cached across ticks
+            if is_fade:
+                fade_ready += 1
+                if phase == "LIVE":
+                    fade_phase_live += 1
+                elif phase == "PRE_GAME":
+                    fade_phase_pre += 1
+                else:
+                    fade_phase_unknown += 1
+            if is_trend:
+                trend_ready += 1
+                if phase == "LIVE":
+                    trend_phase_live += 1
+                elif phase == "PRE_GAME":
+                    trend_phase_pre += 1
+                else:
+                    trend_phase_unknown += 1
+
+        # Reversion rate from recent checked FADE-eligible spikes
+        reversion_rate = total_reverted / total_checked if total_checked > 0 else 0.0
+        # Continuation rate from recent checked TREND-eligible spikes
+        continuation_rate = trend_total_continued / trend_total_checked if trend_total_checked > 0 else 0.0
 
         # ---- FADE composite ----
-        fade_ready_score = score_linear(fade_ready, [
-            (0, 0), (1, 35), (2, 60), (3, 80), (5, 95), (8, 100),
-        ])
-        reversion_score = score_linear(reversion_rate * 100, [
-            (0, 0), (15, 15), (30, 40), (50, 70), (70, 95), (100, 100),
-        ])
+        fade_ready_score = score_linear(fade_ready, READY_BRACKETS)
+        reversion_score = score_linear(reversion_rate * 100, REVERSION_BRACKETS)
         if total_checked < MIN_CHECKED_SPIKES:
             reversion_score = 50.0 if fade_pending > 0 else 0.0
 
-        volatile_score = score_linear(volatile, [
-            (0, 0), (2, 15), (5, 35), (10, 55), (20, 80), (30, 100),
-        ])
-        tight_score = score_linear(tight_entry, [
-            (0, 0), (3, 20), (8, 45), (15, 70), (25, 90), (40, 100),
-        ])
+        volatile_score = score_linear(volatile, VOLATILE_BRACKETS)
+        tight_score = score_linear(tight_entry, TIGHT_BRACKETS)
 
         fade_composite = (
             WEIGHT_FADE_READY * fade_ready_score
@@ -595,19 +849,12 @@ class ActivityTracker:
             fade_composite *= 0.3
 
         # ---- TREND composite ----
-        trend_ready_score = score_linear(trend_ready, [
-            (0, 0), (1, 35), (2, 60), (3, 80), (5, 95), (8, 100),
-        ])
-        # Continuation score: 0% = 0, 40% = 50, 60% = 75, 80%+ = 100
-        continuation_score = score_linear(continuation_rate * 100, [
-            (0, 0), (20, 20), (40, 50), (60, 75), (80, 95), (100, 100),
-        ])
+        trend_ready_score = score_linear(trend_ready, READY_BRACKETS)
+        continuation_score = score_linear(continuation_rate * 100, CONTINUATION_BRACKETS)
         if trend_total_checked < MIN_CHECKED_SPIKES:
             continuation_score = 50.0 if trend_pending > 0 else 0.0
 
-        trend_tight_score = score_linear(trend_tight, [
-            (0, 0), (3, 20), (8, 45), (15, 70), (25, 90), (40, 100),
-        ])
+        trend_tight_score = score_linear(trend_tight, TIGHT_BRACKETS)
 
         trend_composite = (
             WEIGHT_TREND_READY * trend_ready_score
@@ -621,7 +868,7 @@ class ActivityTracker:
         # Overall: best of the two strategies
         composite = max(fade_composite, trend_composite)
 
-        return {
+        metrics = {
             "total_markets": total_markets,
             "warmed_up": warmed_up,
             "ready": ready,
@@ -632,7 +879,7 @@ class ActivityTracker:
             "trend_tight": trend_tight,
             "total_oi": total_oi,
             "recent_spike_count": recent_spike_count,
-            "recent_spikes": recent_list[:TOP_SPIKES_SHOWN],
+            "recent_spikes": tuple(recent_shown),
             # FADE metrics
             "fade_ready_score": fade_ready_score,
             "reversion_rate": reversion_rate,
@@ -660,12 +907,25 @@ class ActivityTracker:
             "tight_score": tight_score,
             "trend_tight_score": trend_tight_score,
             "composite": composite,
-            "update_count": self._update_count,
+            "update_count": update_count,
         }
+        self._cached_metrics = metrics
+        self._cached_until = valid_until
+        return metrics
 
 
 # -------------------- WebSocket Stream --------------------
 
+# Top-level keys marking a bare (unwrapped) update frame in _on_message. The
+# payload-key lookups above it stay as a get/or chain: the common frame hits
+# on the first get, which beats a key-set intersection.
+_BARE_UPDATE_KEYS = frozenset(("market_slug", "marketSlug", "slug", "best_bid", "bestBid"))
+
+# Keys under which an update item may nest its market data (see _handle_update)
+_NESTED_UPDATE_KEYS = frozenset((
+    "market_data_lite", "marketDataLite", "market_data", "marketData",
+))
+
 class WSStream:
     def __init__(self, key_id: str, secret_key: str, tracker: ActivityTracker):
         self.key_id = key_id
@@ -680,17 +940,49 @@ class WSStream:
         self._wildcard_subscribed: bool = False
         self._req_counter = 0
         self._slugs: List[str] = []
+        # Stats counters each have exactly one writer (msg_count/dropped: reader,
+        # coalesced: worker), so plain ints suffice; snapshot() copies them for display.
         self.connected = False
         self.reconnects = 0
         self.msg_count = 0
+        # Reader thread only appends raw frames (deque append is atomic; maxlen drops
+        # the oldest); the worker parses, dispatches and feeds the tracker
+        self._inq: deque = deque(maxlen=WS_QUEUE_MAXSIZE)
+        self._wake = threading.Event()
+        self._ticks: List[Tuple[str, float, float, float]] = []  # worker-only scratch
+        self._worker: Optional[threading.Thread] = None
+        self.dropped = 0
+        self.coalesced = 0
+        # Token bucket for subscribe frames (see _send_subscribe_batches)
+        self._sub_tokens = float(WS_SUBSCRIBE_BURST)
+        self._sub_tokens_ts = time.monotonic()
+        # Unknown slug -> when first reported, so a market discovery filters out
+        # doesn't re-trigger a refresh on every tick; aged out by prune_unknown
+        self._unknown_seen: Dict[str, float] = {}
 
     def set_slugs(self, slugs: List[str]):
         self._slugs = slugs
 
+    def update_slugs(self, slugs: List[str]) -> Tuple[List[str], int]:
+        """Swap in a refreshed market list; return (added slugs, removed count)."""
+        old = set(self._slugs)
+        new = set(slugs)
+        added = list(new.difference(old))
+        removed = len(old.difference(new))
+        self._slugs = slugs
+        return added, removed
+
+    def prune_unknown(self):
+        """Forget unknown slugs discovery now knows, and let a still-filtered one
+        re-trigger at most once per MARKET_STALE_SEC. The worker inserts concurrently,
+        so walk a snapshot and pop rather than rebuild."""
+        cutoff = time.time() - MARKET_STALE_SEC
+        for slug, ts in list(self._unknown_seen.items()):
+            if ts < cutoff or slug in MARKET_META:
+                self._unknown_seen.pop(slug, None)
+
     def _sign(self, method: str, path: str, ts: str) -> str:
-        msg = f"{ts}{method}{path}"
-        sig = self._private_key.sign(msg.encode("utf-8"))
-        return base64.b64encode(sig).decode("utf-8")
+        return sign_request(self._private_key, method, path, ts)
 
     def _ws_headers(self) -> list:
         ts = str(int(time.time() * 1000))
@@ -721,21 +1013,36 @@ class WSStream:
             }
         }
         try:
-            self._ws.send(json.dumps(msg))
+            self._ws.send(json_dumps(msg))
             self._wildcard_subscribed = True
             tee_print("  Subscribed to ALL markets via wildcard (market_slugs: [])")
         except Exception:
             self._wildcard_subscribed = False
             self._subscribe_batched()
 
-    def _subscribe_batched(self):
-        """Fallback: subscribe in batches of 100 if wildcard fails."""
-        slugs = self._slugs
-        if not slugs:
-            return
+    def _take_subscribe_token(self):
+        """Token bucket: free within WS_SUBSCRIBE_BURST, then WS_SUBSCRIBE_RATE/sec."""
+        now = time.monotonic()
+        self._sub_tokens = min(float(WS_SUBSCRIBE_BURST),
+                               self._sub_tokens + (now - self._sub_tokens_ts) * WS_SUBSCRIBE_RATE)
+        self._sub_tokens_ts = now
+        if self._sub_tokens < 1.0:
+            time.sleep((1.0 - self._sub_tokens) / WS_SUBSCRIBE_RATE)
+            self._sub_tokens = 1.0
+            self._sub_tokens_ts = time.monotonic()
+        self._sub_tokens -= 1.0
+
+    def _send_subscribe_batches(self, slugs: List[str]) -> int:
+        """Send 100-slug subscribe frames; returns slugs sent.
+
+        Frames go out back-to-back (the socket send buffer absorbs the burst);
+        the token bucket only sleeps if a burst would exceed the old pacing rate.
+        """
+        sent = 0
         batch_size = 100
         for i in range(0, len(slugs), batch_size):
             batch = slugs[i:i + batch_size]
+            self._take_subscribe_token()
             msg = {
                 "subscribe": {
                     "request_id": self._next_req_id(),
@@ -744,44 +1051,47 @@ class WSStream:
                 }
             }
             try:
-                self._ws.send(json.dumps(msg))
+                self._ws.send(json_dumps(msg))
                 self._subscribed.update(batch)
+                sent += len(batch)
             except Exception:
                 pass
-            time.sleep(0.05)
+        return sent
+
+    def _subscribe_batched(self):
+        """Fallback: subscribe in batches of 100 if wildcard fails."""
+        slugs = self._slugs
+        if not slugs:
+            return
+        self._send_subscribe_batches(slugs)
         tee_print(f"  Subscribed to {len(self._subscribed)} markets via batched fallback")
 
     def subscribe_new(self, slugs: List[str]):
         """No-op when wildcard is active (already receiving all markets)."""
         if self._wildcard_subscribed:
             return
-        new = [s for s in slugs if s not in self._subscribed]
+        # C-level set difference; subscription order doesn't matter to the server
+        new = list(set(slugs).difference(self._subscribed))
         if not new or not self._ws:
             return
-        batch_size = 100
-        for i in range(0, len(new), batch_size):
-            batch = new[i:i + batch_size]
-            msg = {
-                "subscribe": {
-                    "request_id": self._next_req_id(),
-                    "subscription_type": 2,
-                    "market_slugs": batch,
-                }
-            }
-            try:
-                self._ws.send(json.dumps(msg))
-                self._subscribed.update(batch)
-            except Exception:
-                pass
-            time.sleep(0.05)
-        if new:
-            tee_print(f"  Subscribed to {len(new)} new markets")
+        self._send_subscribe_batches(new)
+        tee_print(f"  Subscribed to {len(new)} new markets")
 
-    def _on_message(self, ws, raw_msg: str):
+    def _on_message(self, ws, raw_msg: Union[str, bytes]):
+        """Reader-thread callback: hand the frame off and return to the socket."""
         self.msg_count += 1
+        inq = self._inq
+        if len(inq) == WS_QUEUE_MAXSIZE:
+            self.dropped += 1  # append below evicts the oldest frame
+        inq.append(raw_msg)
+        self._wake.set()
+
+    def _dispatch(self, raw_msg: Union[str, bytes]):
+        # With skip_utf8_validation websocket-client hands text frames over as raw
+        # bytes; orjson / json.loads parse bytes directly, so no decode step.
         try:
-            msg = json.loads(raw_msg)
-        except json.JSONDecodeError:
+            msg = json_loads(raw_msg)
+        except ValueError:  # json.JSONDecodeError / orjson.JSONDecodeError
             return
         if not isinstance(msg, dict):
             return
@@ -815,13 +1125,29 @@ class WSStream:
                     self._handle_update(u)
             return
 
-        if any(k in msg for k in ("market_slug", "marketSlug", "slug", "best_bid", "bestBid")):
+        if not _BARE_UPDATE_KEYS.isdisjoint(msg):
             self._handle_update(msg)
 
     def _handle_update(self, data: dict):
         slug = data.get("market_slug") or data.get("marketSlug") or data.get("slug")
         if not slug:
             return
+        if slug not in MARKET_META and slug not in self._unknown_seen:
+            self._unknown_seen[slug] = time.time()
+            REFRESH_EVENT.set()
+
+        # Fast path: the documented lite update is flat, with snake_case best_bid /
+        # best_ask on the item itself. Same result as the general ladder below
+        # (inner is data and neither price needs a fallback), minus ~20 lookups.
+        best_bid = data.get("best_bid")
+        best_ask = data.get("best_ask")
+        if best_bid and best_ask and _NESTED_UPDATE_KEYS.isdisjoint(data):
+            bid = extract_amount_value(best_bid) or 0.0
+            ask = extract_amount_value(best_ask) or 0.0
+            oi = extract_amount_value(data.get("open_interest") or data.get("openInterest")) or 0.0
+            if bid > 0 and ask > 0 and ask > bid:
+                self._ticks.append((slug, bid, ask, oi))
+            return
 
         inner = (
             data.get("market_data_lite") or data.get("marketDataLite")
@@ -874,7 +1200,43 @@ class WSStream:
         oi = extract_amount_value(open_interest) or 0.0
 
         if bid > 0 and ask > 0 and ask > bid:
-            self._tracker.record_update(slug, bid, ask, oi)
+            self._ticks.append((slug, bid, ask, oi))
+
+    def _consume(self):
+        """Parse queued frames and feed the tracker. When the backlog is deep,
+        coalesce each batch to the latest (bid, ask, oi) per slug — older ticks
+        are stale anyway."""
+        inq = self._inq
+        wake = self._wake
+        coalesce_at = int(WS_QUEUE_MAXSIZE * WS_COALESCE_FRAC)
+        record = self._tracker.record_update
+        tune_current_thread(WS_CPU_CORES, WS_THREAD_NICE)
+        while not STOP.is_set():
+            if not inq:
+                wake.wait(0.5)
+                wake.clear()
+                continue
+            backlog = len(inq)
+            n = 0
+            while inq and n < WS_BATCH_MAX:
+                try:
+                    self._dispatch(inq.popleft())
+                except Exception:
+                    pass  # malformed frame; websocket-client used to swallow these
+                n += 1
+            batch = self._ticks
+            self._ticks = []
+            if backlog >= coalesce_at:
+                latest = {}
+                for item in batch:
+                    latest[item[0]] = item
+                self.coalesced += len(batch) - len(latest)
+                batch = latest.values()
+            for slug, bid, ask, oi in batch:
+                try:
+                    record(slug, bid, ask, oi)
+                except Exception:
+                    pass
 
     def _on_error(self, ws, error):
         pass
@@ -883,6 +1245,7 @@ class WSStream:
         self.connected = False
 
     def _run_forever(self):
+        tune_current_thread(WS_CPU_CORES, WS_THREAD_NICE)
         while not STOP.is_set():
             try:
                 headers = self._ws_headers()
@@ -894,7 +1257,14 @@ class WSStream:
                     on_error=self._on_error,
                     on_close=self._on_close,
                 )
-                self._ws.run_forever(ping_interval=WS_PING_INTERVAL_SEC, ping_timeout=10)
+                # Frames are JSON text; json.loads rejects bad UTF-8 anyway, so skip
+                # websocket-client's per-frame pure-Python UTF-8 validation pass.
+                # Do not advertise permessage-deflate in the headers: websocket-client
+                # has no inflate support, so compressed frames would arrive undecodable.
+                self._ws.run_forever(ping_interval=WS_PING_INTERVAL_SEC, ping_timeout=10,
+                                     skip_utf8_validation=True,
+                                     sockopt=((socket.SOL_SOCKET, socket.SO_SNDBUF, WS_SNDBUF_BYTES),
+                                              (socket.SOL_SOCKET, socket.SO_RCVBUF, WS_RCVBUF_BYTES)))
             except Exception:
                 pass
             if STOP.is_set():
@@ -903,26 +1273,86 @@ class WSStream:
             self._subscribed.clear()
             self._wildcard_subscribed = False
             tee_print(f"  WS reconnecting in {self._reconnect_delay:.0f}s (#{self.reconnects})")
-            time.sleep(self._reconnect_delay)
+            if STOP.wait(self._reconnect_delay):
+                break
             self._reconnect_delay = min(self._reconnect_delay * 2, WS_RECONNECT_MAX_SEC)
 
     def start(self):
+        self._worker = threading.Thread(target=self._consume, daemon=True, name="ws-scan-worker")
+        self._worker.start()
         self._thread = threading.Thread(target=self._run_forever, daemon=True, name="ws-scan")
         self._thread.start()
 
-    def stop(self):
+    def stop(self, timeout: float = 2.0):
+        """Close the socket and wait briefly for the reader and worker to exit."""
         if self._ws:
             try:
                 self._ws.close()
             except Exception:
                 pass
+        for t in (self._thread, self._worker):
+            if t is not None and t is not threading.current_thread():
+                t.join(timeout)
+
+    def snapshot(self) -> dict:
+        """Point-in-time stream stats for the dashboard printer thread."""
+        return {
+            "connected": self.connected,
+            "msg_count": self.msg_count,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "queue_size": len(self._inq),
+        }
 
 
 # -------------------- Dashboard --------------------
 
-def print_dashboard(metrics: dict, ws: WSStream):
-    now_str = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-    ws_status = "CONNECTED" if ws.connected else "DISCONNECTED"
+_SEP_EQ = "=" * 72
+_SEP_DASH = "-" * 72
+_now_str_cache = [0, ""]  # [epoch second, formatted UTC header timestamp]
+
+
+def _strategy_label(bucket: int, has_ready: bool, has_rate: bool, no_data: bool,
+                    bad_label: str) -> str:
+    """Label rules for one strategy; bucket = number of _LABEL_CUTS the score meets."""
+    if bucket >= 3 and has_ready and has_rate:
+        return "FIRE"
+    if bucket >= 2 and has_ready and has_rate:
+        return "HOT"
+    if bucket >= 2 and has_ready and no_data:
+        return "waiting..."
+    if has_ready and not has_rate and not no_data:
+        return bad_label
+    if bucket >= 1:
+        return "building"
+    return "quiet"
+
+
+# Score cut points (building / HOT / FIRE); labels are precomputed for every
+# (bucket, has_ready, has_rate, no_data) combination at import time
+_LABEL_CUTS = (40, SCORE_HOT, SCORE_FIRE)
+_FADE_LABELS = {k: _strategy_label(*k, "not reverting")
+                for k in product(range(4), (False, True), (False, True), (False, True))}
+_TREND_LABELS = {k: _strategy_label(*k, "reverting (bad)")
+                 for k in product(range(4), (False, True), (False, True), (False, True))}
+
+
+def utc_now_str(now: float) -> str:
+    """Header timestamp, formatted at most once per wall-clock second."""
+    sec = int(now)
+    if sec != _now_str_cache[0]:
+        _now_str_cache[0] = sec
+        t = time.gmtime(sec)  # struct_time: no datetime/tzinfo object, no strftime
+        _now_str_cache[1] = (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+                             f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}")
+    return _now_str_cache[1]
+
+
+def render_dashboard(metrics: dict, ws: dict) -> str:
+    """Full dashboard block as one string (no I/O)."""
+    now = time.time()  # one clock read for the header and every spike age
+    now_str = utc_now_str(now)
+    ws_status = "CONNECTED" if ws["connected"] else "DISCONNECTED"
 
     fade_composite = metrics["fade_composite"]
     trend_composite = metrics["trend_composite"]
@@ -937,42 +1367,39 @@ def print_dashboard(metrics: dict, ws: WSStream):
     trend_total_checked = metrics["trend_total_checked"]
     trend_total_continued = metrics["trend_total_continued"]
     trend_pending = metrics["trend_pending"]
+    fade_ready_score = metrics["fade_ready_score"]
+    reversion_score = metrics["reversion_score"]
+    trend_ready_score = metrics["trend_ready_score"]
+    continuation_score = metrics["continuation_score"]
+    volatile_score = metrics["volatile_score"]
+    tight_score = metrics["tight_score"]
+    fade_phase_live = metrics["fade_phase_live"]
+    fade_phase_pre = metrics["fade_phase_pre"]
+    fade_phase_unknown = metrics["fade_phase_unknown"]
+    trend_phase_live = metrics["trend_phase_live"]
+    trend_phase_pre = metrics["trend_phase_pre"]
+    trend_phase_unknown = metrics["trend_phase_unknown"]
+    volatile = metrics["volatile"]
+    tight_entry = metrics["tight_entry"]
+    warmed_up = metrics["warmed_up"]
+    total_markets = metrics["total_markets"]
+    recent_spike_count = metrics["recent_spike_count"]
 
     # Determine FADE label
     has_fade = fade_ready >= 1
     has_reversion = (total_checked >= MIN_CHECKED_SPIKES and reversion_rate >= MIN_REVERSION_RATE)
     fade_no_data = total_checked < MIN_CHECKED_SPIKES
 
-    if fade_composite >= SCORE_FIRE and has_fade and has_reversion:
-        fade_label = "FIRE"
-    elif fade_composite >= SCORE_HOT and has_fade and has_reversion:
-        fade_label = "HOT"
-    elif fade_composite >= SCORE_HOT and has_fade and fade_no_data:
-        fade_label = "waiting..."
-    elif has_fade and not has_reversion and not fade_no_data:
-        fade_label = "not reverting"
-    elif fade_composite >= 40:
-        fade_label = "building"
-    else:
-        fade_label = "quiet"
+    fade_label = _FADE_LABELS[(bisect_right(_LABEL_CUTS, fade_composite),
+                               has_fade, has_reversion, fade_no_data)]
 
     # Determine TREND label
     has_trend = trend_ready >= 1
     has_continuation = (trend_total_checked >= MIN_CHECKED_SPIKES and continuation_rate >= MIN_CONTINUATION_RATE)
     trend_no_data = trend_total_checked < MIN_CHECKED_SPIKES
 
-    if trend_composite >= SCORE_FIRE and has_trend and has_continuation:
-        trend_label = "FIRE"
-    elif trend_composite >= SCORE_HOT and has_trend and has_continuation:
-        trend_label = "HOT"
-    elif trend_composite >= SCORE_HOT and has_trend and trend_no_data:
-        trend_label = "waiting..."
-    elif has_trend and not has_continuation and not trend_no_data:
-        trend_label = "reverting (bad)"
-    elif trend_composite >= 40:
-        trend_label = "building"
-    else:
-        trend_label = "quiet"
+    trend_label = _TREND_LABELS[(bisect_right(_LABEL_CUTS, trend_composite),
+                                 has_trend, has_continuation, trend_no_data)]
 
     # Overall label
     best = "FADE" if fade_composite >= trend_composite else "TREND"
@@ -982,19 +1409,24 @@ def print_dashboard(metrics: dict, ws: WSStream):
         overall_label = f"*** HOT -- {best} looks good ***"
     elif composite >= 40:
         overall_label = "(building up -- watch closely)"
-    elif metrics["warmed_up"] < 10:
+    elif warmed_up < 10:
         overall_label = "(warming up -- z-scores not ready yet)"
     else:
         overall_label = "(quiet -- not worth trading)"
 
-    tee_print()
-    tee_print("=" * 72)
-    tee_print(f"POLYMARKET SCANNER v4 | {now_str} UTC | WS: {ws_status} | msgs: {ws.msg_count}")
-    tee_print("=" * 72)
+    lines: List[str] = []
+    out = lines.append
+
+    out("")
+    out(_SEP_EQ)
+    out(f"POLYMARKET SCANNER v4 | {now_str} UTC | WS: {ws_status} | msgs: {ws['msg_count']}")
+    if ws["dropped"] or ws["coalesced"]:
+        out(f"  WS backlog: {ws['dropped']} dropped, {ws['coalesced']} coalesced (queue {ws['queue_size']}/{WS_QUEUE_MAXSIZE})")
+    out(_SEP_EQ)
 
     # ---- FADE section ----
-    tee_print(f"  FADE  (mean reversion)  score: {fade_composite:.0f}/100  [{fade_label}]")
-    tee_print(f"    Ready (z 3.5-6):  {fade_ready:<3} mkts  {score_bar(metrics['fade_ready_score'])}  {metrics['fade_ready_score']:.0f}")
+    out(f"  FADE  (mean reversion)  score: {fade_composite:.0f}/100  [{fade_label}]")
+    out(f"    Ready (z 3.5-6):  {fade_ready:<3} mkts  {score_bar(fade_ready_score)}  {fade_ready_score:.0f}")
 
     if total_checked > 0:
         rev_pct_str = f"{reversion_rate*100:.0f}%"
@@ -1008,16 +1440,16 @@ def print_dashboard(metrics: dict, ws: WSStream):
     else:
         rev_pct_str = "n/a"
         rev_detail = "(no spikes yet)"
-    tee_print(f"    Reversion rate:   {rev_pct_str:<5}       {score_bar(metrics['reversion_score'])}  {metrics['reversion_score']:.0f}  {rev_detail}")
+    out(f"    Reversion rate:   {rev_pct_str:<5}       {score_bar(reversion_score)}  {reversion_score:.0f}  {rev_detail}")
 
     if fade_ready > 0:
-        tee_print(f"    Game phase:       {metrics['fade_phase_live']} live, {metrics['fade_phase_pre']} pre, {metrics['fade_phase_unknown']} unknown")
-        if metrics['fade_phase_live'] == 0 and metrics['fade_phase_unknown'] == 0:
-            tee_print(f"    ** Penalized 0.3x (all pre-game)")
+        out(f"    Game phase:       {fade_phase_live} live, {fade_phase_pre} pre, {fade_phase_unknown} unknown")
+        if fade_phase_live == 0 and fade_phase_unknown == 0:
+            out(f"    ** Penalized 0.3x (all pre-game)")
 
     # ---- TREND section ----
-    tee_print(f"  TREND (momentum)        score: {trend_composite:.0f}/100  [{trend_label}]")
-    tee_print(f"    Ready (z>=3.5):   {trend_ready:<3} mkts  {score_bar(metrics['trend_ready_score'])}  {metrics['trend_ready_score']:.0f}")
+    out(f"  TREND (momentum)        score: {trend_composite:.0f}/100  [{trend_label}]")
+    out(f"    Ready (z>=3.5):   {trend_ready:<3} mkts  {score_bar(trend_ready_score)}  {trend_ready_score:.0f}")
 
     if trend_total_checked > 0:
         cont_pct_str = f"{continuation_rate*100:.0f}%"
@@ -1031,44 +1463,71 @@ def print_dashboard(metrics: dict, ws: WSStream):
     else:
         cont_pct_str = "n/a"
         cont_detail = "(no spikes yet)"
-    tee_print(f"    Continuation:     {cont_pct_str:<5}       {score_bar(metrics['continuation_score'])}  {metrics['continuation_score']:.0f}  {cont_detail}")
+    out(f"    Continuation:     {cont_pct_str:<5}       {score_bar(continuation_score)}  {continuation_score:.0f}  {cont_detail}")
 
     if trend_ready > 0:
-        tee_print(f"    Game phase:       {metrics['trend_phase_live']} live, {metrics['trend_phase_pre']} pre, {metrics['trend_phase_unknown']} unknown")
-        if metrics['trend_phase_live'] == 0 and metrics['trend_phase_unknown'] == 0:
-            tee_print(f"    ** Penalized 0.3x (all pre-game)")
+        out(f"    Game phase:       {trend_phase_live} live, {trend_phase_pre} pre, {trend_phase_unknown} unknown")
+        if trend_phase_live == 0 and trend_phase_unknown == 0:
+            out(f"    ** Penalized 0.3x (all pre-game)")
 
     # ---- Shared metrics ----
-    tee_print(f"  Shared metrics:")
-    tee_print(f"    Volatile (z>=1.5):  {metrics['volatile']:<3} mkts  {score_bar(metrics['volatile_score'])}  {metrics['volatile_score']:.0f}")
-    tee_print(f"    Tight (<4%):        {metrics['tight_entry']:<3} mkts  {score_bar(metrics['tight_score'])}  {metrics['tight_score']:.0f}")
-    tee_print(f"    Warmup: {metrics['warmed_up']}/{metrics['total_markets']} markets have {MIN_WARMUP}+ data points")
-    tee_print("-" * 72)
-    tee_print(f"  BEST:  {composite:.0f} / 100  ({best})   {overall_label}")
-    if metrics["recent_spike_count"] > 0:
-        tee_print(f"  Spikes in last 5 min: {metrics['recent_spike_count']}")
-    tee_print("-" * 72)
-
-    spikes = metrics.get("recent_spikes", [])
+    out(f"  Shared metrics:")
+    out(f"    Volatile (z>=1.5):  {volatile:<3} mkts  {score_bar(volatile_score)}  {volatile_score:.0f}")
+    out(f"    Tight (<4%):        {tight_entry:<3} mkts  {score_bar(tight_score)}  {tight_score:.0f}")
+    out(f"    Warmup: {warmed_up}/{total_markets} markets have {MIN_WARMUP}+ data points")
+    out(_SEP_DASH)
+    out(f"  BEST:  {composite:.0f} / 100  ({best})   {overall_label}")
+    if recent_spike_count > 0:
+        out(f"  Spikes in last 5 min: {recent_spike_count}")
+    out(_SEP_DASH)
+
+    spikes = metrics.get("recent_spikes", ())
     if spikes:
-        tee_print(f"  Recent spikes (F=FADE, T=TREND eligible):")
-        for item in spikes:
-            ts, slug, z, mid_val, spread = item[0], item[1], item[2], item[3], item[4]
-            tag = item[5] if len(item) > 5 else ""
-            age = time.time() - ts
+        out(f"  Recent spikes (F=FADE, T=TREND eligible):")
+        for ts, line in spikes:
+            age = now - ts
             age_str = f"{age:.0f}s ago" if age < 60 else f"{age/60:.0f}m ago"
-            display_slug = slug[:30] if len(slug) > 30 else slug
-            direction = "SPIKE" if z > 0 else "DIP"
-            tag_str = f" [{tag}]" if tag else ""
-            tee_print(f"    {display_slug:<31} z={z:+.1f} {direction:<5} mid={mid_val:.3f} "
-                      f"spread={spread*100:.1f}%{tag_str} ({age_str})")
+            out(f"{line} ({age_str})")
     else:
-        tee_print(f"  No eligible spikes yet")
-        tee_print(f"    FADE: z {Z_TRADEABLE}-{Z_MAX_FADE}, spread<{MAX_SPREAD_FADE*100:.0f}%")
-        tee_print(f"    TREND: z>={Z_MIN_TREND}, spread<{MAX_SPREAD_TREND*100:.0f}%")
-        tee_print(f"    Both: mid {MIN_MID}-{MAX_MID}")
+        out(f"  No eligible spikes yet")
+        out(f"    FADE: z {Z_TRADEABLE}-{Z_MAX_FADE}, spread<{MAX_SPREAD_FADE*100:.0f}%")
+        out(f"    TREND: z>={Z_MIN_TREND}, spread<{MAX_SPREAD_TREND*100:.0f}%")
+        out(f"    Both: mid {MIN_MID}-{MAX_MID}")
 
-    tee_print("=" * 72)
+    out(_SEP_EQ)
+
+    return "\n".join(lines)
+
+
+def print_dashboard(metrics: dict, ws: dict):
+    # One write per stream, and one log flush per dashboard rather than per line
+    tee_print(render_dashboard(metrics, ws), flush=True)
+
+
+# winsound.Beep blocks for the full duration; play it on a single-slot worker
+_beep_q: queue.Queue = queue.Queue(maxsize=1)
+
+
+def _beep_worker():
+    while not STOP.is_set():
+        try:
+            freq, dur = _beep_q.get(timeout=1)
+        except queue.Empty:
+            continue
+        try:
+            winsound.Beep(freq, dur)
+        except RuntimeError:
+            pass
+
+
+def request_beep(freq: int, dur: int):
+    """Fire-and-forget beep; dropped if one is already pending."""
+    if not HAS_WINSOUND:
+        return
+    try:
+        _beep_q.put_nowait((freq, dur))
+    except queue.Full:
+        pass
 
 
 def alert_if_needed(metrics: dict, state: dict):
@@ -1077,28 +1536,33 @@ def alert_if_needed(metrics: dict, state: dict):
     if now - last < ALERT_COOLDOWN_SEC:
         return
 
-    fade_composite = metrics["fade_composite"]
-    trend_composite = metrics["trend_composite"]
+    # Cheapest gate first: with no ready markets for either strategy there is
+    # nothing to alert on, so skip the remaining lookups (the common quiet case).
     fade_ready = metrics["fade_ready"]
     trend_ready = metrics["trend_ready"]
-    reversion_rate = metrics["reversion_rate"]
-    continuation_rate = metrics["continuation_rate"]
-    total_checked = metrics["total_checked"]
-    trend_total_checked = metrics["trend_total_checked"]
+    if fade_ready < 1 and trend_ready < 1:
+        return
 
     # Check FADE conditions
     fade_ok = False
-    if fade_ready >= 1 and total_checked >= MIN_CHECKED_SPIKES and reversion_rate >= MIN_REVERSION_RATE:
-        fade_ok = True
+    if fade_ready >= 1:
+        reversion_rate = metrics["reversion_rate"]
+        fade_ok = (metrics["total_checked"] >= MIN_CHECKED_SPIKES
+                   and reversion_rate >= MIN_REVERSION_RATE)
 
     # Check TREND conditions
     trend_ok = False
-    if trend_ready >= 1 and trend_total_checked >= MIN_CHECKED_SPIKES and continuation_rate >= MIN_CONTINUATION_RATE:
-        trend_ok = True
+    if trend_ready >= 1:
+        continuation_rate = metrics["continuation_rate"]
+        trend_ok = (metrics["trend_total_checked"] >= MIN_CHECKED_SPIKES
+                    and continuation_rate >= MIN_CONTINUATION_RATE)
 
     if not fade_ok and not trend_ok:
         return
 
+    fade_composite = metrics["fade_composite"]
+    trend_composite = metrics["trend_composite"]
+
     # Build alert message parts
     parts = []
     if fade_ok:
@@ -1111,45 +1575,67 @@ def alert_if_needed(metrics: dict, state: dict):
 
     if best_score >= SCORE_FIRE:
         tee_print(f"\n  *** BEEP *** {detail}")
-        if HAS_WINSOUND:
-            winsound.Beep(BEEP_FREQ_FIRE, BEEP_DUR_FIRE)
+        request_beep(BEEP_FREQ_FIRE, BEEP_DUR_FIRE)
         state["last_alert_ts"] = now
     elif best_score >= SCORE_HOT:
         tee_print(f"\n  *** BEEP *** {detail}")
-        if HAS_WINSOUND:
-            winsound.Beep(BEEP_FREQ_HOT, BEEP_DUR_HOT)
+        request_beep(BEEP_FREQ_HOT, BEEP_DUR_HOT)
         state["last_alert_ts"] = now
 
 
+def dashboard_thread(dash_q: queue.Queue):
+    """Render dashboards off the main loop so slow console/log I/O never delays sampling."""
+    tune_current_thread(AUX_CPU_CORES)
+    while not STOP.is_set():
+        try:
+            metrics, ws_snap = dash_q.get(timeout=1)
+        except queue.Empty:
+            continue
+        try:
+            print_dashboard(metrics, ws_snap)
+        except Exception as e:
+            tee_print(f"  Dashboard error: {e}", flush=True)
+
+
 # -------------------- Market Refresh Thread --------------------
 
 def refresh_thread(client: RestClient, ws: WSStream):
+    tune_current_thread(AUX_CPU_CORES)
+    last_refresh = time.time()
     while not STOP.is_set():
-        STOP.wait(MARKET_REFRESH_SEC)
+        # Wake on the periodic timer, or early when the WS sees a market we don't know
+        if REFRESH_EVENT.wait(MARKET_REFRESH_SEC):
+            wait_left = MARKET_REFRESH_MIN_SEC - (time.time() - last_refresh)
+            if wait_left > 0:
+                STOP.wait(wait_left)
+        REFRESH_EVENT.clear()
         if STOP.is_set():
             break
+        last_refresh = time.time()
         try:
             tee_print("\n  Refreshing market list...")
             slugs = client.discover_markets()
             if slugs:
-                ws.set_slugs(slugs)
-                ws.subscribe_new(slugs)
-                tee_print(f"  Refresh complete: {len(slugs)} markets")
+                added, removed = ws.update_slugs(slugs)
+                if added:
+                    ws.subscribe_new(added)
+                ws.prune_unknown()
+                tee_print(f"  Refresh complete: {len(slugs)} markets (+{len(added)} / -{removed})")
         except Exception as e:
-            tee_print(f"  Refresh error: {e}")
+            tee_print(f"  Refresh error: {e}", flush=True)
 
 
 # -------------------- Main --------------------
 
 def main():
     if not POLYMARKET_KEY_ID or not POLYMARKET_SECRET_KEY:
-        tee_print("ERROR: Set POLYMARKET_KEY_ID and POLYMARKET_SECRET_KEY env vars")
+        tee_print("ERROR: Set POLYMARKET_KEY_ID and POLYMARKET_SECRET_KEY env vars", flush=True)
         tee_print("  . .\\creds.ps1")
         return
 
-    tee_print("=" * 72)
+    tee_print(_SEP_EQ)
     tee_print("POLYMARKET US ACTIVITY SCANNER v4.0")
-    tee_print("=" * 72)
+    tee_print(_SEP_EQ)
     tee_print(f"  FADE:  z {Z_TRADEABLE}-{Z_MAX_FADE}, spread<{MAX_SPREAD_FADE*100:.0f}%, reversion>{REVERSION_THRESHOLD*100:.0f}%")
     tee_print(f"  TREND: z>={Z_MIN_TREND}, spread<{MAX_SPREAD_TREND*100:.0f}%, continuation>{CONTINUATION_THRESHOLD*100:.0f}%")
     tee_print(f"  Both:  mid {MIN_MID}-{MAX_MID}, check after {REVERSION_CHECK_SEC}s")
@@ -1158,16 +1644,20 @@ def main():
     tee_print()
 
     def shutdown(sig, frame):
-        tee_print("\n  Shutting down...")
+        # No tee_print/flush_log here: both take _print_lock, which the main thread
+        # may already hold when the signal lands. main() flushes after the loop.
+        os.write(1, b"\n  Shutting down...\n")
         STOP.set()
+        REFRESH_EVENT.set()  # unblock refresh_thread
     signal.signal(signal.SIGINT, shutdown)
     signal.signal(signal.SIGTERM, shutdown)
+    threading.Thread(target=_log_flusher, daemon=True, name="log-flush").start()
 
     tee_print("  Discovering markets...")
     client = RestClient(POLYMARKET_KEY_ID, POLYMARKET_SECRET_KEY)
     slugs = client.discover_markets()
     if not slugs:
-        tee_print("  ERROR: No markets found")
+        tee_print("  ERROR: No markets found", flush=True)
         return
     tee_print(f"  Found {len(slugs)} active markets")
 
@@ -1179,6 +1669,12 @@ def main():
     t = threading.Thread(target=refresh_thread, args=(client, ws), daemon=True, name="refresh")
     t.start()
 
+    dash_q: queue.Queue = queue.Queue(maxsize=DASHBOARD_QUEUE_MAXSIZE)
+    dt = threading.Thread(target=dashboard_thread, args=(dash_q,), daemon=True, name="dashboard")
+    dt.start()
+    if HAS_WINSOUND:
+        threading.Thread(target=_beep_worker, daemon=True, name="beep").start()
+
     tee_print(f"  Waiting for data... (first dashboard in {DASHBOARD_INTERVAL_SEC}s)")
     tee_print(f"  Note: reversion data takes ~{REVERSION_CHECK_SEC}s after first spike to populate\n")
 
@@ -1190,11 +1686,17 @@ def main():
             break
 
         metrics = tracker.get_metrics()
-        print_dashboard(metrics, ws)
+        try:
+            dash_q.put_nowait((metrics, ws.snapshot()))
+        except queue.Full:
+            pass  # printer still behind; skip this render rather than stall
         alert_if_needed(metrics, alert_state)
 
     ws.stop()
+    dt.join(2.0)
+    t.join(2.0)
     tee_print("  Scanner stopped.")
+    flush_log()
 
 
 if __name__ == "__main__":
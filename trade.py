@@ -26,9 +26,12 @@ import threading
 import atexit
 import logging
 import base64
+import binascii
 import hashlib
-from collections import deque
-from functools import wraps
+import heapq
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps, lru_cache
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
@@ -39,29 +42,36 @@ try:
 except ImportError:
     HAS_ED25519 = False
 
-_original_dumps = json.dumps
-
-def patched_dumps(obj, **kwargs):
-    effective_kwargs = {
-        'sort_keys': True,
-        'ensure_ascii': False,
-        **kwargs
-    }
-    if 'separators' not in kwargs:
-        effective_kwargs['separators'] = (',', ':')
-    return _original_dumps(obj, **effective_kwargs)
-
-json.dumps = patched_dumps
-
 try:
     import psutil
     HAS_PSUTIL = True
 except ImportError:
     HAS_PSUTIL = False
 
-from dataclasses import dataclass, field
-from datetime import datetime, date, timezone
-from typing import Dict, Optional, List, Tuple, Any, Set
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    HAS_INOTIFY = True
+except ImportError:
+    HAS_INOTIFY = False
+
+json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+def canonical_dumps(obj) -> bytes:
+    """Compact, key-sorted UTF-8 JSON for request bodies sent alongside a signature."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+from dataclasses import dataclass, field, fields
+from datetime import date
+from types import MappingProxyType
+from typing import Dict, Optional, List, Tuple, Any, Set, Mapping
 
 try:
     from web3 import Web3
@@ -78,9 +88,10 @@ class _Tee:
         self._original = original
         self._log_file = log_file
     def write(self, data):
+        # No per-write flush: the main loop flushes once per pass, and logging
+        # handlers call flush() after each record
         self._original.write(data)
         self._log_file.write(data)
-        self._log_file.flush()
     def flush(self):
         self._original.flush()
         self._log_file.flush()
@@ -133,6 +144,7 @@ MAX_MID_PRICE = 0.40
 MAX_SPREAD_BASE = 0.10
 MAX_SPREAD_MID = 0.13
 MAX_SPREAD_HIGH = 0.16
+_SPREAD_CAPS = (MAX_SPREAD_BASE, MAX_SPREAD_MID, MAX_SPREAD_HIGH)  # indexed by (abs_z >= 4) + (abs_z >= 5)
 MIN_VOLUME = 10  # Match monitor V24_MIN — volume is now openInterest proxy, not dollar volume
 
 MAX_LOSSES_PER_MARKET = 2
@@ -143,6 +155,10 @@ FADE_NO_SIDE_ONLY = True      # Only take BUY_NO (NO-side) trades for FADE — B
 BLOCK_PRE_GAME = True         # Block all pre-game entries (consistent losers)
 BLOCK_POST_GAME = True        # Block post-game entries (market settling, no reversion)
 ALLOW_UNKNOWN_PHASE = True    # Allow entries when phase can't be determined
+# The three switches above folded into one membership test for try_open
+_BLOCKED_PHASES = frozenset(
+    phase for phase, blocked in (("PRE_GAME", BLOCK_PRE_GAME), ("POST_GAME", BLOCK_POST_GAME),
+                                 ("UNKNOWN", not ALLOW_UNKNOWN_PHASE)) if blocked)
 
 # Polymarket score-based late-game close contest filter: block when game is in final period AND score is tight
 # Spikes in these conditions are real game events, not noise — FADE loses
@@ -179,9 +195,9 @@ SIGNAL_CLUSTER_WINDOW_SEC = 300   # 5 min lookback window
 SIGNAL_CLUSTER_MIN_COUNT = 10     # Need 10+ signals before considering TREND
 SIGNAL_CLUSTER_RATIO = 0.75       # 75%+ same-direction signals = sustained move → TREND
 
-MARKET_BLOCKLIST = {
+MARKET_BLOCKLIST = frozenset({
     "106290179211046540747289269936667551104628138202727334337396394027502415762364",
-}
+})
 
 PAPER_FEE_RATE = 0.005
 LIVE_FEE_RATE = 0.005
@@ -250,6 +266,13 @@ class PMUSEnums:
     EXEC_FILL = "EXECUTION_TYPE_FILL"
     EXEC_PARTIAL_FILL = "EXECUTION_TYPE_PARTIAL_FILL"
 
+# Enum groupings used by the fill/liquidity checks, built once
+_FILL_STATES = frozenset((PMUSEnums.STATE_FILLED, PMUSEnums.STATE_PARTIALLY_FILLED))
+_NO_FILL_STATES = frozenset((PMUSEnums.STATE_CANCELED, PMUSEnums.STATE_REJECTED, PMUSEnums.STATE_EXPIRED))
+_FILL_EXEC_TYPES = frozenset((PMUSEnums.EXEC_FILL, PMUSEnums.EXEC_PARTIAL_FILL))
+_CROSS_ASK_INTENTS = frozenset((PMUSEnums.BUY_LONG, PMUSEnums.SELL_SHORT))
+_CROSS_BID_INTENTS = frozenset((PMUSEnums.BUY_SHORT, PMUSEnums.SELL_LONG))
+
 MIDS_JSON_PATH = "poly_mids_latest.json"
 MIDS_MAX_AGE_SEC = 30.0
 CSV_MIDS_MAX_AGE_SEC = 1200.0
@@ -257,12 +280,16 @@ CSV_MIDS_MAX_AGE_SEC = 1200.0
 STATUS_EVERY_SEC = 5.0
 SUMMARY_EVERY_SEC = 10.0
 CLEANUP_EVERY_SEC = 60
+GC_GEN0_THRESHOLD = 50000  # parsed rows are freed by refcount; collect gen0 far less often
 
 MAX_REARM_ENTRIES = 1000
 REARM_TTL_SEC = 3600
 MAX_LATEST_MIDS = 500
 LATEST_MIDS_TTL_SEC = 120
 MAX_TAILER_LINES = 100
+MAIN_LOOP_SLEEP_SEC = 0.25
+CSV_WAKE_COALESCE_MS = 50  # with inotify: gather appends this long after the first before waking
+TAILER_READ_CHARS = 262144  # per-poll read cap; a busy monitor can append well over 64 KB between polls
 
 TRIGGERS_CSV = os.getenv("TRIGGERS_CSV", f"poly_us_triggers_{date.today().isoformat()}.csv")
 OUTLIERS_CSV = os.getenv("OUTLIERS_CSV", f"poly_us_outliers_{date.today().isoformat()}.csv")
@@ -277,22 +304,23 @@ DEBUG_REJECTIONS = os.getenv("DEBUG_REJECTIONS", "false").lower() == "true"
 
 class RateLimiter:
     def __init__(self, max_calls: int = RATE_LIMIT_CALLS, window_sec: float = RATE_LIMIT_WINDOW_SEC):
+        # Token bucket: refills at max_calls/window_sec, holds at most max_calls
         self._lock = threading.Lock()
-        self._calls: deque = deque()
-        self._max_calls = max_calls
-        self._window = window_sec
+        self._rate = max_calls / window_sec
+        self._cap = float(max_calls)
+        self._tokens = float(max_calls)
+        self._last = time.monotonic()
     
     def wait(self):
         with self._lock:
-            now = time.time()
-            while self._calls and self._calls[0] < now - self._window:
-                self._calls.popleft()
-            if len(self._calls) >= self._max_calls:
-                sleep_time = self._calls[0] + self._window - now + 0.01
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                return self.wait()
-            self._calls.append(now)
+            now = time.monotonic()
+            self._tokens = min(self._cap, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            # Reserve a token; a negative balance is the queue of callers ahead of us
+            self._tokens -= 1.0
+            sleep_time = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if sleep_time > 0:
+            time.sleep(sleep_time)
 
 rate_limiter = RateLimiter()
 
@@ -310,7 +338,7 @@ def rate_limited(func):
 def create_session() -> requests.Session:
     sess = requests.Session()
     retries = Retry(total=3, backoff_factor=1.0, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["GET", "POST", "DELETE"])
-    adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
+    adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=max(10, RATE_LIMIT_CALLS))
     sess.mount("https://", adapter)
     sess.mount("http://", adapter)
     return sess
@@ -325,7 +353,8 @@ def now() -> float:
     return time.time()
 
 def utc_ts() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    # time.gmtime skips building an aware datetime; same output
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
 
 def get_memory_mb() -> float:
     if HAS_PSUTIL:
@@ -333,6 +362,18 @@ def get_memory_mb() -> float:
     return 0.0
 
 def to_float(x, default: float = float('nan')) -> float:
+    # Exact-type checks first: most callers already hold a float or int
+    t = type(x)
+    if t is float:
+        return x
+    if t is int:
+        try:
+            return float(x)
+        except OverflowError:  # ints beyond float range, as the slow path handles them
+            return default
+    return _to_float_slow(x, default)
+
+def _to_float_slow(x, default: float) -> float:
     try:
         if x is None:
             return default
@@ -346,6 +387,9 @@ def to_float(x, default: float = float('nan')) -> float:
         return default
 
 def to_upper(s) -> str:
+    # Already-normalised enum strings ("BUY", "FILLED", ...) are returned as-is
+    if type(s) is str and s.isupper() and not s[0].isspace() and not s[-1].isspace():
+        return s
     return str(s or "").strip().upper()
 
 def ensure_file_exists(path: str):
@@ -356,15 +400,29 @@ def ensure_file_exists(path: str):
 def safe_open(path: str, mode: str):
     return open(path, mode, newline="", encoding="utf-8", errors="replace")
 
-def load_latest_mids(path: str) -> dict:
+# (path, st_mtime_ns, st_size) -> parsed+trimmed mids, so an unchanged file isn't re-parsed
+_mids_cache: Dict[str, Any] = {"key": None, "data": {}}
+
+def load_latest_mids(path: str) -> Dict[str, Tuple[float, float]]:
+    """Read the monitor's latest-mids JSON as {tid: (mid, ts)}, same layout as csv_mids."""
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            j = json.load(f)
-            if isinstance(j, dict):
-                if len(j) > MAX_LATEST_MIDS:
-                    sorted_items = sorted(j.items(), key=lambda x: x[1].get('ts', 0) if isinstance(x[1], dict) else 0, reverse=True)
-                    return dict(sorted_items[:MAX_LATEST_MIDS])
-                return j
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        if key != _mids_cache["key"]:
+            with open(path, "rb") as f:
+                buf = f.read()
+            j = json_loads(buf)
+            if not isinstance(j, dict):
+                return {}
+            # Normalise once per file change; an unparsable mid/ts fails the range/age checks
+            mids = {tid: (to_float(rec.get("mid")), to_float(rec.get("ts"), 0.0))
+                    for tid, rec in j.items() if isinstance(rec, dict)}
+            if len(mids) > MAX_LATEST_MIDS:
+                mids = dict(heapq.nlargest(MAX_LATEST_MIDS, mids.items(), key=lambda x: x[1][1]))
+            _mids_cache["key"] = key
+            _mids_cache["data"] = mids
+        # Shared, not copied: brokers never mutate latest_mids in place (cleanup rebuilds it)
+        return _mids_cache["data"]
     except Exception:
         pass
     return {}
@@ -393,22 +451,32 @@ def is_late_close_contest(game_phase: str, pm_period: int, pm_score_diff: int, s
 TRADE_FIELDS = ["ts", "event", "slug", "side", "qty", "entry_mid", "exit_mid", "pnl", "cash_after", "reason", "fee", "z_score", "strategy"]
 
 _trades_header_written = False
+_trades_fh = None
+_trades_writerow = None
+_trades_lock = threading.Lock()
 
 def ensure_trades_header():
-    """Truncate trades CSV and write fresh header (once per run)."""
-    global _trades_header_written
+    """Truncate trades CSV, write fresh header and keep the file open (once per run)."""
+    global _trades_header_written, _trades_fh, _trades_writerow
     if _trades_header_written:
         return
-    with safe_open(TRADES_CSV, "w") as f:
-        csv.writer(f).writerow(TRADE_FIELDS)
+    _trades_fh = safe_open(TRADES_CSV, "w")
+    _trades_writerow = csv.writer(_trades_fh).writerow
+    _trades_writerow(TRADE_FIELDS)
+    _trades_fh.flush()
+    atexit.register(_trades_fh.close)
     _trades_header_written = True
 
 def append_trade(row: dict):
-    ensure_trades_header()
-    with safe_open(TRADES_CSV, "a") as f:
-        w = csv.DictWriter(f, fieldnames=TRADE_FIELDS)
-        complete = {k: row.get(k, "") for k in TRADE_FIELDS}
-        w.writerow(complete)
+    """Buffer a trade row; flush_trades() writes out everything queued this loop pass."""
+    with _trades_lock:
+        ensure_trades_header()
+        _trades_writerow([row.get(k, "") for k in TRADE_FIELDS])
+
+def flush_trades():
+    with _trades_lock:
+        if _trades_fh is not None:
+            _trades_fh.flush()
 
 # =========================
 # Rearm tracking
@@ -417,16 +485,18 @@ def append_trade(row: dict):
 class RearmTracker:
     def __init__(self, max_entries: int = MAX_REARM_ENTRIES, ttl_sec: float = REARM_TTL_SEC):
         self._lock = threading.Lock()
-        self._data: Dict[str, float] = {}  # tid -> last_close_ts
+        # tid -> last_close_ts (monotonic), oldest first so expiry pops from the front
+        self._data: "OrderedDict[str, float]" = OrderedDict()
         self._context: Dict[str, dict] = {}  # tid -> {entry_mid, side}
         self._max_entries = max_entries
         self._ttl_sec = ttl_sec
-        self._last_cleanup = time.time()
+        self._last_cleanup = time.monotonic()
 
     def can_rearm(self, tid: str) -> bool:
         with self._lock:
             self._maybe_cleanup()
-            return (now() - self._data.get(tid, 0.0)) >= MIN_REARM_SEC
+            last = self._data.get(tid)
+            return last is None or (time.monotonic() - last) >= MIN_REARM_SEC
 
     def is_trending_against(self, tid: str, current_mid: float, side: str) -> bool:
         """Block re-entry if price has drifted further against the FADE thesis.
@@ -456,29 +526,32 @@ class RearmTracker:
 
     def touch(self, tid: str, entry_mid: float = 0, side: str = ""):
         with self._lock:
-            self._data[tid] = now()
+            self._data[tid] = time.monotonic()
+            self._data.move_to_end(tid)
             if entry_mid > 0 and side:
                 self._context[tid] = {"entry_mid": entry_mid, "side": side}
 
     def _maybe_cleanup(self):
-        current = time.time()
+        current = time.monotonic()
         if current - self._last_cleanup < 60:
             return
         self._last_cleanup = current
         cutoff = current - self._ttl_sec
-        expired = [tid for tid, ts in self._data.items() if ts < cutoff]
-        for tid in expired:
-            del self._data[tid]
+        data = self._data
+        # Entries are in touch order, so only the expired prefix is visited
+        while data:
+            tid, ts = next(iter(data.items()))
+            if ts >= cutoff:
+                break
+            data.popitem(last=False)
+            self._context.pop(tid, None)
+        while len(data) > self._max_entries:
+            tid, _ = data.popitem(last=False)
             self._context.pop(tid, None)
-        if len(self._data) > self._max_entries:
-            sorted_items = sorted(self._data.items(), key=lambda x: x[1])
-            for tid, _ in sorted_items[:len(self._data) - self._max_entries]:
-                del self._data[tid]
-                self._context.pop(tid, None)
 
     def force_cleanup(self):
         with self._lock:
-            self._last_cleanup = 0
+            self._last_cleanup = float("-inf")
             self._maybe_cleanup()
 
     def __len__(self) -> int:
@@ -495,15 +568,19 @@ class MarketLossTracker:
     def __init__(self, max_losses: int = MAX_LOSSES_PER_MARKET):
         self._lock = threading.Lock()
         self._losses: Dict[str, int] = {}
+        # Slugs at the loss limit; only grows, so readers can test membership without the lock
+        self._blocked: Set[str] = set()
         self._max_losses = max_losses
     
     def record_loss(self, slug: str):
         with self._lock:
-            self._losses[slug] = self._losses.get(slug, 0) + 1
+            n = self._losses.get(slug, 0) + 1
+            self._losses[slug] = n
+            if n >= self._max_losses:
+                self._blocked.add(slug)
     
     def is_blocked(self, slug: str) -> bool:
-        with self._lock:
-            return self._losses.get(slug, 0) >= self._max_losses
+        return slug in self._blocked
     
     def get_losses(self, slug: str) -> int:
         with self._lock:
@@ -515,7 +592,7 @@ market_loss_tracker = MarketLossTracker()
 # Position
 # =========================
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     tid: str
     side: str
@@ -532,11 +609,25 @@ class Position:
     peak_last_updated: float = 0.0
     consecutive_profit_mids: int = 0
     strategy: str = "FADE"
+    side_sign: int = field(init=False, default=0)  # +1 long YES, -1 long NO; side never changes
+
+    def __post_init__(self):
+        self.side_sign = 1 if self.side in ("BUY", "BUY_LONG") else -1
 
     @property
     def slug(self) -> str:
         return self.tid
 
+def position_totals(positions: Dict[str, Position], current_mid) -> Tuple[float, float]:
+    """(locked capital, unrealized PnL) in one walk over the open positions;
+    current_mid is the broker's get_current_yes_mid."""
+    locked = 0.0
+    unrealized = 0.0
+    for pos in positions.values():
+        locked += pos.cost_basis
+        unrealized += pos.side_sign * pos.qty * (current_mid(pos) - pos.entry_mid)
+    return locked, unrealized
+
 # =========================
 # Profit/Loss helpers
 # =========================
@@ -567,17 +658,23 @@ TRAILING_MIN_CONSECUTIVE = 2
 
 def check_trailing_stop(pos: Position, current: float, is_stale: bool = False,
                         activate_pct: float = TRAILING_ACTIVATE_PCT,
-                        stop_pct: float = TRAILING_STOP_PCT) -> Tuple[bool, float]:
+                        stop_pct: float = TRAILING_STOP_PCT,
+                        now_ts: Optional[float] = None) -> Tuple[bool, float]:
     if not ENABLE_TRAILING_STOP:
         return False, pos.peak_profit_pct
 
     profit_pct = _calc_profit_pct(pos.side, pos.entry_mid, current)
-    current_time = time.time()
+    current_time = now_ts if now_ts is not None else time.time()
     new_peak = pos.peak_profit_pct
 
-    if pos.peak_last_updated > 0 and (current_time - pos.peak_last_updated) > TRAILING_PEAK_DECAY_SEC:
-        new_peak = new_peak * (1.0 - TRAILING_PEAK_DECAY_RATE)
-        pos.peak_last_updated = current_time
+    if pos.peak_last_updated > 0:
+        elapsed = current_time - pos.peak_last_updated
+        if elapsed > TRAILING_PEAK_DECAY_SEC:
+            # Apply every decay step that elapsed since the last one, so a gap between
+            # checks doesn't collapse several steps into one; keep the step phase
+            steps = int(elapsed // TRAILING_PEAK_DECAY_SEC)
+            new_peak = new_peak * (1.0 - TRAILING_PEAK_DECAY_RATE) ** steps
+            pos.peak_last_updated += steps * TRAILING_PEAK_DECAY_SEC
 
     if not is_stale and profit_pct > new_peak:
         new_peak = profit_pct
@@ -598,30 +695,42 @@ def check_trailing_stop(pos: Position, current: float, is_stale: bool = False,
 
     return False, new_peak
 
-def get_exit_params(strategy: str) -> dict:
-    """Return exit thresholds for the given strategy."""
-    if strategy == "CONVERGENCE":
-        return {
-            "tp": 1.0, "sl": CONV_EMERGENCY_SL_PCT,
-            "time": CONV_MAX_HOLD_SEC, "be_sec": CONV_MAX_HOLD_SEC,
-            "be_tol": 0.0,
-            "trail_activate": 1.0, "trail_stop": 1.0,
-        }
-    if strategy == "TREND":
-        return {
-            "tp": TREND_TP_PCT, "sl": TREND_SL_PCT,
-            "time": TREND_TIME_EXIT_SEC, "be_sec": TREND_BREAKEVEN_EXIT_SEC,
-            "be_tol": TREND_BREAKEVEN_TOLERANCE,
-            "trail_activate": TREND_TRAILING_ACTIVATE_PCT,
-            "trail_stop": TREND_TRAILING_STOP_PCT,
-        }
-    return {
+# Exit thresholds per strategy, built once; read-only views since they're shared
+_EXIT_PARAMS: Dict[str, Mapping[str, float]] = {
+    "CONVERGENCE": MappingProxyType({
+        "tp": 1.0, "sl": CONV_EMERGENCY_SL_PCT,
+        "time": CONV_MAX_HOLD_SEC, "be_sec": CONV_MAX_HOLD_SEC,
+        "be_tol": 0.0,
+        "trail_activate": 1.0, "trail_stop": 1.0,
+    }),
+    "TREND": MappingProxyType({
+        "tp": TREND_TP_PCT, "sl": TREND_SL_PCT,
+        "time": TREND_TIME_EXIT_SEC, "be_sec": TREND_BREAKEVEN_EXIT_SEC,
+        "be_tol": TREND_BREAKEVEN_TOLERANCE,
+        "trail_activate": TREND_TRAILING_ACTIVATE_PCT,
+        "trail_stop": TREND_TRAILING_STOP_PCT,
+    }),
+    "FADE": MappingProxyType({
         "tp": TP_PCT, "sl": SL_PCT,
         "time": TIME_EXIT_SEC_PRIMARY, "be_sec": BREAKEVEN_EXIT_SEC,
         "be_tol": BREAKEVEN_TOLERANCE,
         "trail_activate": TRAILING_ACTIVATE_PCT,
         "trail_stop": TRAILING_STOP_PCT,
-    }
+    }),
+}
+
+def get_exit_params(strategy: str) -> Mapping[str, float]:
+    """Return exit thresholds for the given strategy (FADE for anything unknown)."""
+    return _EXIT_PARAMS.get(strategy, _EXIT_PARAMS["FADE"])
+
+# Log prefix per strategy; FADE is the default and goes untagged
+_STRATEGY_TAGS = {"TREND": "[TREND] ", "CONVERGENCE": "[CONVERGENCE] "}
+
+# Close reason -> broker counter attribute (shared by PaperBroker and LiveBroker)
+_REASON_COUNTERS = {
+    "tp": "_tp_count", "sl": "_sl_count", "time_exit": "_time_count",
+    "breakeven": "_be_count", "trailing_stop": "_trail_count",
+}
 
 # =========================
 # PaperBroker
@@ -633,7 +742,7 @@ class PaperBroker:
     cash: float = field(init=False)
     positions: Dict[str, Position] = field(default_factory=dict)
     realized_pnl: float = 0.0
-    latest_mids: Dict[str, dict] = field(default_factory=dict)
+    latest_mids: Dict[str, Tuple[float, float]] = field(default_factory=dict)  # tid -> (mid, ts)
     csv_mids: Dict[str, Tuple[float, float]] = field(default_factory=dict)
     _last_mids_cleanup: float = field(default=0.0, repr=False)
     _trade_count: int = field(default=0, repr=False)
@@ -658,24 +767,12 @@ class PaperBroker:
     def fee_for_notional(self, notional: float) -> float:
         return abs(notional) * PAPER_FEE_RATE
 
-    def _is_long_yes(self, side: str) -> bool:
-        return side in ("BUY", "BUY_LONG")
-
-    def get_unrealized_pnl(self) -> float:
-        total = 0.0
-        for pos in self.positions.values():
-            current_mid = self.get_current_yes_mid(pos)
-            if self._is_long_yes(pos.side):
-                total += pos.qty * (current_mid - pos.entry_mid)
-            else:
-                total += pos.qty * (pos.entry_mid - current_mid)
-        return total
-
-    def get_locked_capital(self) -> float:
-        return sum(pos.cost_basis for pos in self.positions.values())
+    def _position_totals(self) -> Tuple[float, float]:
+        return position_totals(self.positions, self.get_current_yes_mid)
 
     def get_equity(self) -> float:
-        return self.cash + self.get_locked_capital() + self.get_unrealized_pnl()
+        locked, unrealized = self._position_totals()
+        return self.cash + locked + unrealized
 
     def is_blocked(self, tid: str) -> bool:
         return tid in MARKET_BLOCKLIST or market_loss_tracker.is_blocked(tid)
@@ -752,23 +849,18 @@ class PaperBroker:
         return pos
 
     def get_current_yes_mid(self, pos: Position) -> float:
-        try:
-            rec = self.latest_mids.get(pos.tid)
-            if rec:
-                mid = float(rec.get("mid"))
-                ts = float(rec.get("ts"))
-                if 0.0 < mid < 1.0 and time.time() - ts <= MIDS_MAX_AGE_SEC:
-                    return mid
-        except Exception:
-            pass
-        try:
-            csv_rec = self.csv_mids.get(pos.tid)
-            if csv_rec:
-                mid, ts = csv_rec
-                if 0.0 < mid < 1.0 and time.time() - ts <= CSV_MIDS_MAX_AGE_SEC:
-                    return mid
-        except Exception:
-            pass
+        # Both sources hold pre-validated (mid, ts) float tuples; NaN fails the range check
+        t = time.time()
+        rec = self.latest_mids.get(pos.tid)
+        if rec is not None:
+            mid, ts = rec
+            if 0.0 < mid < 1.0 and t - ts <= MIDS_MAX_AGE_SEC:
+                return mid
+        rec = self.csv_mids.get(pos.tid)
+        if rec is not None:
+            mid, ts = rec
+            if 0.0 < mid < 1.0 and t - ts <= CSV_MIDS_MAX_AGE_SEC:
+                return mid
         return pos.entry_mid
 
     def get_executable_exit_price(self, pos: Position) -> float:
@@ -776,23 +868,19 @@ class PaperBroker:
         return self.get_current_yes_mid(pos)
 
     def _is_stale_mid(self, pos: Position, current: float) -> bool:
-        if abs(current - pos.entry_mid) < 1e-6:
-            csv_rec = self.csv_mids.get(pos.tid)
-            if csv_rec and (time.time() - csv_rec[1]) > CSV_MIDS_MAX_AGE_SEC:
-                return True
-            json_rec = self.latest_mids.get(pos.tid)
-            if json_rec and (time.time() - float(json_rec.get("ts", 0))) > MIDS_MAX_AGE_SEC:
-                return True
-            return True
-        return False
+        # get_current_yes_mid only returns entry_mid when no fresh csv/json mid exists,
+        # so an unchanged mid is stale whatever the source timestamps say
+        return abs(current - pos.entry_mid) < 1e-6
 
     def close(self, tid: str, exit_mid: float, reason: str) -> Optional[Tuple[Position, float]]:
-        pos = self.positions.get(tid)
-        if not pos or not (0 < exit_mid < 1):
+        if not (0 < exit_mid < 1):
+            return None
+        pos = self.positions.pop(tid, None)
+        if not pos:
             return None
         exit_notional = pos.qty * exit_mid
         fee_close = self.fee_for_notional(exit_notional)
-        if self._is_long_yes(pos.side):
+        if pos.side_sign > 0:
             proceeds = exit_notional - fee_close
             self.cash += proceeds
             pnl_gross = pos.qty * (exit_mid - pos.entry_mid)
@@ -806,13 +894,10 @@ class PaperBroker:
         else:
             self._losses += 1
             market_loss_tracker.record_loss(tid)
-        if reason == "tp": self._tp_count += 1
-        elif reason == "sl": self._sl_count += 1
-        elif reason == "time_exit": self._time_count += 1
-        elif reason == "breakeven": self._be_count += 1
-        elif reason == "trailing_stop": self._trail_count += 1
+        attr = _REASON_COUNTERS.get(reason)
+        if attr:
+            setattr(self, attr, getattr(self, attr) + 1)
         self.realized_pnl += pnl_after_fee
-        del self.positions[tid]
         self._trade_count += 1
         append_trade({
             "ts": utc_ts(), "event": "CLOSE", "slug": tid, "side": pos.side,
@@ -824,30 +909,27 @@ class PaperBroker:
         })
         return pos, pnl_after_fee
 
-    def cleanup_latest_mids(self):
-        current_time = time.time()
+    def cleanup_latest_mids(self, now_ts: Optional[float] = None):
+        current_time = now_ts if now_ts is not None else time.time()
         if current_time - self._last_mids_cleanup < 30:
             return
         self._last_mids_cleanup = current_time
-        active_tids = set(self.positions.keys())
+        active = self.positions
         cutoff = current_time - LATEST_MIDS_TTL_SEC
-        to_remove = [tid for tid, data in self.latest_mids.items() 
-                     if tid not in active_tids or (isinstance(data, dict) and data.get('ts', 0) < cutoff)]
-        for tid in to_remove:
-            del self.latest_mids[tid]
+        # Rebuild rather than delete in place: the dict may be load_latest_mids' cached copy
+        self.latest_mids = {tid: rec for tid, rec in self.latest_mids.items()
+                            if tid in active and rec[1] >= cutoff}
 
     def cleanup_all(self):
-        self.cleanup_latest_mids()
-        active_tids = set(self.positions.keys())
-        cutoff = time.time() - CSV_MIDS_MAX_AGE_SEC * 2
-        to_remove = [tid for tid, (_, ts) in self.csv_mids.items()
-                     if tid not in active_tids and ts < cutoff]
-        for tid in to_remove:
-            del self.csv_mids[tid]
+        t = time.time()
+        self.cleanup_latest_mids(t)
+        active = self.positions
+        cutoff = t - CSV_MIDS_MAX_AGE_SEC * 2
+        self.csv_mids = {tid: rec for tid, rec in self.csv_mids.items()
+                         if tid in active or rec[1] >= cutoff}
 
     def get_status_dict(self) -> dict:
-        locked = self.get_locked_capital()
-        unrealized = self.get_unrealized_pnl()
+        locked, unrealized = self._position_totals()
         equity = self.cash + locked + unrealized
         total = self._wins + self._losses
         win_rate = self._wins / max(1, total) * 100
@@ -866,23 +948,28 @@ class PaperBroker:
 # Polymarket US Auth (FIXED)
 # =========================
 
+@lru_cache(maxsize=256)
+def _sign_suffix(method: str, path: str) -> bytes:
+    """METHOD+path part of the signed message; only the timestamp varies per request."""
+    return (method.upper() + path).encode("utf-8")
+
 class PolymarketUSAuth:
     def __init__(self, api_key_id: str, api_secret_b64: str):
         if not HAS_ED25519:
             raise ImportError("cryptography package required: pip install cryptography")
         self.api_key_id = api_key_id
+        # Key is decoded and loaded once; each request only pays for the Ed25519 sign
         secret_bytes = base64.b64decode(api_secret_b64)
         self._private_key = Ed25519PrivateKey.from_private_bytes(secret_bytes[:32])
     
     def sign_request(self, method: str, path: str, body: str = "") -> dict:
         """Polymarket US signing: timestamp + METHOD + path (body is NOT part of signature)"""
         timestamp = str(int(time.time() * 1000))
-        message = timestamp + method.upper() + path
-        signature = self._private_key.sign(message.encode("utf-8"))
+        signature = self._private_key.sign(timestamp.encode("ascii") + _sign_suffix(method, path))
         return {
             "X-PM-Access-Key": self.api_key_id,
             "X-PM-Timestamp": timestamp,
-            "X-PM-Signature": base64.b64encode(signature).decode("utf-8"),
+            "X-PM-Signature": binascii.b2a_base64(signature, newline=False).decode("ascii"),
             "Content-Type": "application/json",
         }
 
@@ -890,6 +977,12 @@ class PolymarketUSAuth:
 # LiveBroker (with cancel fix + order ID extraction)
 # =========================
 
+# Runs the portfolio fallback check alongside the order-status GET in _wait_for_fill
+# (threads are only spawned on first submit, so paper mode pays nothing)
+_fill_poll_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fill-poll")
+# Fetches stale position books concurrently before a valuation pass
+_price_fetch_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="price-fetch")
+
 @dataclass 
 class LiveBroker:
     auth: Any = field(init=False, default=None)
@@ -939,8 +1032,8 @@ class LiveBroker:
             for ex in executions:
                 if not isinstance(ex, dict):
                     continue
-                ex_type = str(ex.get("type", "")).upper()
-                if ex_type in (PMUSEnums.EXEC_FILL, PMUSEnums.EXEC_PARTIAL_FILL):
+                ex_type = to_upper(ex.get("type"))
+                if ex_type in _FILL_EXEC_TYPES:
                     last_px = ex.get("lastPx")
                     if isinstance(last_px, dict):
                         fill_price = to_float(last_px.get("value"), 0.0)
@@ -952,14 +1045,13 @@ class LiveBroker:
                             fill_price = self._extract_avg_price(order_obj)
                     return True, fill_price
         # Check root-level state (order may have state directly in response)
-        _FILL_STATES = (PMUSEnums.STATE_FILLED, PMUSEnums.STATE_PARTIALLY_FILLED)
-        state = str(resp.get("state") or resp.get("status") or "").upper()
+        state = to_upper(resp.get("state") or resp.get("status"))
         if state in _FILL_STATES:
             return True, self._extract_avg_price(resp)
         # Check nested order object if present
         order_obj = resp.get("order")
         if isinstance(order_obj, dict):
-            state = str(order_obj.get("state") or order_obj.get("status") or "").upper()
+            state = to_upper(order_obj.get("state") or order_obj.get("status"))
             if state in _FILL_STATES:
                 return True, self._extract_avg_price(order_obj)
         return False, 0.0
@@ -973,7 +1065,7 @@ class LiveBroker:
         try:
             resp = http_session.get(url, headers=headers, timeout=10)
             resp.raise_for_status()
-            return resp.json()
+            return json_loads(resp.content)
         except Exception as e:
             logger.error(f"API GET {path} failed: {e}")
             return None
@@ -981,12 +1073,12 @@ class LiveBroker:
     def _api_post(self, path: str, body: dict) -> Optional[dict]:
         rate_limiter.wait()
         url = PM_US_BASE_URL + path
-        body_str = json.dumps(body, separators=(',', ':'), sort_keys=True)
+        body_bytes = canonical_dumps(body)
         headers = self.auth.sign_request("POST", path)
         try:
-            resp = http_session.post(url, headers=headers, data=body_str, timeout=10)
+            resp = http_session.post(url, headers=headers, data=body_bytes, timeout=10)
             resp.raise_for_status()
-            return resp.json()
+            return json_loads(resp.content)
         except requests.exceptions.HTTPError as e:
             logger.error(f"API POST {path} HTTP error: {e} | Response: {getattr(e.response, 'text', 'N/A')}")
             return None
@@ -1007,9 +1099,10 @@ class LiveBroker:
         return self.cash
 
     def sync_balance(self, force: bool = False):
-        if not force and time.time() - self._last_balance_sync < BALANCE_SYNC_INTERVAL_SEC:
+        t = time.time()
+        if not force and t - self._last_balance_sync < BALANCE_SYNC_INTERVAL_SEC:
             return
-        self._last_balance_sync = time.time()
+        self._last_balance_sync = t
         new_cash = self._get_account_balance()
         if new_cash > 0 and abs(new_cash - self.cash) > 0.01:
             logger.info(f"[BALANCE] Synced: ${self.cash:.2f} -> ${new_cash:.2f}")
@@ -1025,21 +1118,13 @@ class LiveBroker:
     def fee_for_notional(self, notional: float) -> float:
         return abs(notional) * LIVE_FEE_RATE
 
-    def get_locked_capital(self) -> float:
-        return sum(pos.cost_basis for pos in self.positions.values())
-
-    def get_unrealized_pnl(self) -> float:
-        total = 0.0
-        for pos in self.positions.values():
-            current_mid = self.get_current_yes_mid(pos)
-            if self._is_long_yes(pos.side):
-                total += pos.qty * (current_mid - pos.entry_mid)
-            else:
-                total += pos.qty * (pos.entry_mid - current_mid)
-        return total
+    def _position_totals(self) -> Tuple[float, float]:
+        self.prefetch_prices(list(self.positions))
+        return position_totals(self.positions, self.get_current_yes_mid)
 
     def get_equity(self) -> float:
-        return self.cash + self.get_locked_capital() + self.get_unrealized_pnl()
+        locked, unrealized = self._position_totals()
+        return self.cash + locked + unrealized
 
     def is_blocked(self, tid: str) -> bool:
         return tid in MARKET_BLOCKLIST or market_loss_tracker.is_blocked(tid)
@@ -1058,11 +1143,14 @@ class LiveBroker:
         return self._api_get(f"/v1/markets/{market_slug}/book")
 
     def _debug_liquidity(self, market_slug: str, intent: str, order_price: float, qty: float, book: Optional[dict] = None):
-        """Log full order book state for debugging IOC failures."""
-        if not book:
-            book = self._get_order_book(market_slug)
+        """Log full order book state for debugging IOC failures.
+
+        Only logs the book the caller already fetched: no book means the /book GET
+        just failed, and re-fetching here would put another round trip before the order."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         if not book:
-            logger.warning(f"[DEBUG] Could not fetch order book for {market_slug}")
+            logger.warning(f"[DEBUG] No order book for {market_slug} (priced from /bbo fallback or slippage)")
             return
         data = book.get("marketData", book)
         state = data.get("state", "UNKNOWN")
@@ -1078,8 +1166,8 @@ class LiveBroker:
             price = px.get("value", px) if isinstance(px, dict) else px
             logger.info(f"[DEBUG]   ASK {i+1}: {price} x {offer.get('qty', '?')}")
         # BUY_LONG/SELL_SHORT cross the ask; BUY_SHORT/SELL_LONG cross the bid
-        crosses_ask = intent in (PMUSEnums.BUY_LONG, PMUSEnums.SELL_SHORT)
-        crosses_bid = intent in (PMUSEnums.BUY_SHORT, PMUSEnums.SELL_LONG)
+        crosses_ask = intent in _CROSS_ASK_INTENTS
+        crosses_bid = intent in _CROSS_BID_INTENTS
         if crosses_ask and offers:
             best_ask_px = offers[0].get("px", {})
             best_ask = to_float(best_ask_px.get("value", best_ask_px) if isinstance(best_ask_px, dict) else best_ask_px, 0.0)
@@ -1136,6 +1224,15 @@ class LiveBroker:
             return cached[0], cached[1], cached[2]
         return 0.0, 0.0, 0.0
 
+    def prefetch_prices(self, tids: List[str]):
+        """Refresh every stale price-cache entry at once (one round trip instead of N);
+        the per-position reads that follow then hit the cache."""
+        t = time.time()
+        cache = self._price_cache
+        stale = [tid for tid in tids if not ((c := cache.get(tid)) and t - c[3] < 5)]
+        if len(stale) > 1:
+            list(_price_fetch_pool.map(self._refresh_price_cache, stale))
+
     def get_current_yes_mid(self, pos: Position) -> float:
         mid, _, _ = self._refresh_price_cache(pos.tid)
         return mid if mid > 0 else pos.entry_mid
@@ -1144,7 +1241,7 @@ class LiveBroker:
         """Return the executable exit price (bid for SELL_LONG, ask for SELL_SHORT).
         Prevents TP from firing on inflated mid when spread is wide/asymmetric."""
         mid, bid, ask = self._refresh_price_cache(pos.tid)
-        if self._is_long_yes(pos.side):
+        if pos.side_sign > 0:
             # SELL_LONG crosses the bid
             if bid > 0:
                 return bid
@@ -1217,27 +1314,45 @@ class LiveBroker:
                         return True, avg_price
         return False, 0.0
 
+    @staticmethod
+    def _log_discarded_check(future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Discarded portfolio check failed: {future.exception()}")
+
+    def _discard_position_check(self, future):
+        """Drop a concurrent _check_position_exists whose answer is no longer needed.
+        Cancel it if it hasn't started; otherwise let it finish in the background and
+        only log a failure, so _wait_for_fill never blocks on it."""
+        if future is None or future.cancel():
+            return
+        future.add_done_callback(self._log_discarded_check)
+
     def _wait_for_fill(self, order_id: str, market_slug: str, timeout_sec: float = ORDER_TIMEOUT_SEC, is_close: bool = False) -> Tuple[bool, float]:
         start = time.time()
         attempts = 0
         time.sleep(FILL_POLL_DELAY_SEC)  # Initial delay for order propagation
         while time.time() - start < timeout_sec and attempts < FILL_POLL_ATTEMPTS:
             attempts += 1
+            # Every 3rd attempt the portfolio fallback is fetched concurrently with the
+            # order status (both are independent GETs on the pooled session)
+            pos_future = _fill_poll_pool.submit(self._check_position_exists, market_slug) if attempts % 3 == 0 else None
             # Try order status polling first
             order = self._get_order_status(order_id)
             if order and isinstance(order, dict):
-                state = (order.get("state") or order.get("status") or "").upper()
+                state = to_upper(order.get("state") or order.get("status"))
                 logger.info(f"Order {order_id[:12]}... poll #{attempts} state={state}")
-                if state in (PMUSEnums.STATE_FILLED, PMUSEnums.STATE_PARTIALLY_FILLED):
+                if state in _FILL_STATES:
+                    self._discard_position_check(pos_future)
                     return True, self._extract_avg_price(order)
-                elif state in (PMUSEnums.STATE_CANCELED, PMUSEnums.STATE_REJECTED, PMUSEnums.STATE_EXPIRED):
+                elif state in _NO_FILL_STATES:
                     logger.info(f"Order {order_id[:12]}... exchange says {state}, no fill")
+                    self._discard_position_check(pos_future)
                     return False, 0.0
             else:
                 logger.info(f"Order {order_id[:12]}... poll #{attempts} status=404/None")
             # Every 3rd attempt, also check portfolio as fallback
-            if attempts % 3 == 0:
-                has_pos, avg_price = self._check_position_exists(market_slug)
+            if pos_future is not None:
+                has_pos, avg_price = pos_future.result()
                 if is_close:
                     # For CLOSE orders: position GONE = close succeeded, position EXISTS = close failed
                     if not has_pos:
@@ -1357,7 +1472,8 @@ class LiveBroker:
         if not order_id:
             logger.error(f"No order ID returned: {resp}")
             return None
-        logger.debug(f"Order response for {tid}: {json.dumps(resp, default=str)[:500]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Order response for {tid}: {json.dumps(resp, default=str)[:500]}")
         filled, fill_price = self._parse_fill_from_response(resp)
         if filled:
             logger.info(f"Order {order_id[:12]}... filled immediately at {fill_price:.4f}")
@@ -1479,7 +1595,7 @@ class LiveBroker:
         intent = self._side_to_close_intent(pos.side)
         # Book-based close pricing (same approach as entry)
         bbo_bid, bbo_ask, _ = self._extract_book_bbo(slug)
-        if self._is_long_yes(pos.side):
+        if pos.side_sign > 0:
             # SELL_LONG: must cross the bid → price at best_bid - buffer
             if bbo_bid > 0:
                 order_price = max(bbo_bid - CROSS_BUFFER, 0.001)
@@ -1543,7 +1659,7 @@ class LiveBroker:
             logger.error(f"All close attempts failed for {tid}")
             return None
         actual_exit_price = fill_price if fill_price > 0 else exit_mid  # YES-side price
-        if self._is_long_yes(pos.side):
+        if pos.side_sign > 0:
             exit_notional = pos.qty * actual_exit_price
             fee_close = self.fee_for_notional(exit_notional)
             proceeds = exit_notional - fee_close
@@ -1559,13 +1675,12 @@ class LiveBroker:
         else:
             self._losses += 1
             market_loss_tracker.record_loss(tid)
-        if reason == "tp": self._tp_count += 1
-        elif reason == "sl": self._sl_count += 1
-        elif reason == "time_exit": self._time_count += 1
-        elif reason == "breakeven": self._be_count += 1
-        elif reason == "trailing_stop": self._trail_count += 1
+        attr = _REASON_COUNTERS.get(reason)
+        if attr:
+            setattr(self, attr, getattr(self, attr) + 1)
         self.realized_pnl += pnl
         del self.positions[tid]
+        self._price_cache.pop(tid, None)
         self._trade_count += 1
         append_trade({
             "ts": utc_ts(), "event": "CLOSE", "slug": tid, "side": pos.side,
@@ -1579,20 +1694,18 @@ class LiveBroker:
         return pos, pnl
 
     def cleanup_all(self):
-        active = set(self.positions.keys())
-        for tid in list(self._price_cache.keys()):
-            if tid not in active:
-                del self._price_cache[tid]
+        # _price_cache only holds open positions' tokens and is pruned in close()
         self.sync_balance()
 
     def get_status_dict(self) -> dict:
         total = self._wins + self._losses
+        locked, unrealized = self._position_totals()
         return {
             "open": len(self.positions), "cash": self.cash,
-            "locked": self.get_locked_capital(),
-            "unrealized_pnl": self.get_unrealized_pnl(),
+            "locked": locked,
+            "unrealized_pnl": unrealized,
             "realized_pnl": self.realized_pnl,
-            "equity": self.get_equity(),
+            "equity": self.cash + locked + unrealized,
             "trades": self._trade_count, "wins": self._wins,
             "losses": self._losses,
             "win_rate": self._wins / max(1, total) * 100,
@@ -1619,24 +1732,39 @@ class TailState:
             try: self._fh.close()
             except: pass
         self._fh = safe_open(self.path, "r")
+        if hasattr(os, "posix_fadvise"):
+            # Append-only tail: let the kernel read ahead aggressively
+            try: os.posix_fadvise(self._fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError: pass
         self._fh.seek(0, os.SEEK_END)
         self._offset = self._fh.tell()
     
     def read_new_lines(self, max_lines: int = MAX_TAILER_LINES) -> List[str]:
         with self._lock:
             try:
-                if os.path.getsize(self.path) < self._offset:
+                # End-of-file via the open handle instead of a stat per poll;
+                # monitor truncates in place, so a shrink still shows up here
+                end = self._fh.seek(0, os.SEEK_END)
+                if end < self._offset:
                     self._open()
                     return []
+                if end == self._offset:
+                    return []
                 self._fh.seek(self._offset)
-                content = self._fh.read(65536)
+                content = self._fh.read(TAILER_READ_CHARS)
                 if not content:
                     return []
                 last_nl = content.rfind('\n')
                 if last_nl == -1:
                     return []
                 self._offset += last_nl + 1
-                return content[:last_nl].splitlines()[-max_lines:]
+                # Split only a line-aligned suffix holding the last max_lines lines
+                start = last_nl
+                for _ in range(max_lines + 1):
+                    start = content.rfind('\n', 0, start)
+                    if start == -1:
+                        break
+                return content[start + 1:last_nl].splitlines()[-max_lines:]
             except Exception:
                 try: self._open()
                 except: pass
@@ -1649,7 +1777,7 @@ class TailState:
                 except: pass
                 self._fh = None
 
-@dataclass
+@dataclass(slots=True)
 class SkipCounters:
     z_out_of_band: int = 0
     rearm_gate: int = 0
@@ -1674,10 +1802,14 @@ class SkipCounters:
     trending_reentry: int = 0
     signals_processed: int = 0
     def clear(self):
-        for k in self.__dict__:
+        for k in _SKIP_NAMES:
             setattr(self, k, 0)
     def has_any(self) -> bool:
-        return any(v > 0 for v in self.__dict__.values())
+        return any(getattr(self, k) for k in _SKIP_NAMES)
+    def items(self) -> List[Tuple[str, int]]:
+        return [(k, getattr(self, k)) for k in _SKIP_NAMES]
+
+_SKIP_NAMES = tuple(f.name for f in fields(SkipCounters))
 
 # ---------- Adaptive strategy selection ----------
 
@@ -1869,156 +2001,104 @@ def extract_signal_direction(row: Dict[str, str]) -> Optional[str]:
         return "DIP"
     return None
 
-def row_to_signal_from_triggers(row: Dict[str, str]) -> Optional[Tuple[str, str, float, float]]:
-    if to_upper(row.get("decision")) != "ACCEPT":
-        return None
-    hint = to_upper(row.get("hint_candidate"))
-    if FADE_ONLY_TRIGGERS and hint != "FADE":
-        return None
-    slug = (row.get("market_slug") or row.get("tid") or "").strip()
-    if not slug:
-        return None
-    mid = to_float(row.get("mid"))
-    if not (0 < mid < 1):
-        return None
-    delta = to_float(row.get("delta"), 0.0)
-    delta_pct = abs(delta) / mid if mid > 0 else 0.0
-    if delta_pct < MIN_DELTA_PCT or delta_pct > MAX_DELTA_PCT:
-        return None
-    abs_z = abs(to_float(row.get("abs_z") or row.get("z"), 0.0))
-    spread = to_float(row.get("spread"), 0.0)
-    max_spread = MAX_SPREAD_HIGH if abs_z >= 5.0 else MAX_SPREAD_MID if abs_z >= 4.0 else MAX_SPREAD_BASE
-    if spread > max_spread:
-        return None
-    volume = to_float(row.get("volume"), 0.0)
-    if volume < MIN_VOLUME:
-        return None
-    regime = to_upper(row.get("regime"))
-    if regime and regime not in ("MEAN_REVERT", ""):
-        return None
-    sig = to_upper(row.get("signal"))
-    if sig == "SPIKE":
-        side = "BUY_NO"
-    elif sig == "DIP":
-        side = "BUY"
-    else:
-        ds = to_float(row.get("direction_strength"))
-        if math.isfinite(ds) and ds != 0:
-            side = "BUY_NO" if ds > 0 else "BUY"
-        elif math.isfinite(delta) and delta != 0:
-            side = "BUY_NO" if delta > 0 else "BUY"
-        else:
-            side = "BUY" if mid < 0.5 else "BUY_NO"
-    return slug, side, mid, abs_z
-
-def row_to_signal_from_outliers(row: Dict[str, str]) -> Optional[Tuple[str, str, float, float]]:
-    if to_upper(row.get("trade_hint")) != "FADE":
-        return None
-    z = to_float(row.get("z"))
-    abs_z = abs(z) if math.isfinite(z) else to_float(row.get("abs_z"), 0.0)
-    if abs_z < Z_OPEN_OUTLIER:
-        return None
-    slug = (row.get("market_slug") or row.get("tid") or "").strip()
-    if not slug:
-        return None
-    mid = to_float(row.get("mid"))
-    if not (0 < mid < 1):
-        return None
-    delta = to_float(row.get("delta"), 0.0)
-    delta_pct = abs(delta) / mid if mid > 0 else 0.0
-    if delta_pct < MIN_DELTA_PCT or delta_pct > MAX_DELTA_PCT:
-        return None
-    spread = to_float(row.get("spread"), 0.0)
-    max_spread = MAX_SPREAD_HIGH if abs_z >= 5.0 else MAX_SPREAD_MID if abs_z >= 4.0 else MAX_SPREAD_BASE
-    if spread > max_spread:
-        return None
-    volume = to_float(row.get("volume"), 0.0)
-    if volume < MIN_VOLUME:
-        return None
-    regime = to_upper(row.get("regime"))
-    if regime and regime not in ("MEAN_REVERT", ""):
-        return None
-    side = "BUY_NO" if (math.isfinite(z) and z > 0) else "BUY"
-    return slug, side, mid, abs_z
-
-# ---------- TREND signal parsers (momentum following — enter WITH the move) ----------
+# (slug, side, mid, abs_z, delta_pct) as produced by the row parsers below
+Signal = Tuple[str, str, float, float, float]
 
-def row_to_trend_from_triggers(row: Dict[str, str]) -> Optional[Tuple[str, str, float, float]]:
-    """Parse TREND signal from triggers CSV — same quality gates but enters WITH the move."""
-    if not ENABLE_TREND:
-        return None
+def row_to_signals_from_triggers(row: Dict[str, str]) -> Tuple[Optional[Signal], Optional[Signal]]:
+    """Parse a triggers row into (FADE, TREND) candidates, running the shared quality gates once."""
     if to_upper(row.get("decision")) != "ACCEPT":
-        return None
-    # Accept both FADE and TREND hints — during live games we follow momentum regardless
+        return None, None
     hint = to_upper(row.get("hint_candidate"))
-    if hint not in ("FADE", "TREND"):
-        return None
+    fade_ok = hint == "FADE" or not FADE_ONLY_TRIGGERS
+    # TREND accepts both FADE and TREND hints — during live games we follow momentum regardless
+    trend_ok = ENABLE_TREND and hint in ("FADE", "TREND")
+    if not (fade_ok or trend_ok):
+        return None, None
     slug = (row.get("market_slug") or row.get("tid") or "").strip()
     if not slug:
-        return None
+        return None, None
     mid = to_float(row.get("mid"))
     if not (0 < mid < 1):
-        return None
+        return None, None
     delta = to_float(row.get("delta"), 0.0)
     delta_pct = abs(delta) / mid if mid > 0 else 0.0
     if delta_pct < MIN_DELTA_PCT or delta_pct > MAX_DELTA_PCT:
-        return None
+        return None, None
     abs_z = abs(to_float(row.get("abs_z") or row.get("z"), 0.0))
     spread = to_float(row.get("spread"), 0.0)
-    max_spread = MAX_SPREAD_HIGH if abs_z >= 5.0 else MAX_SPREAD_MID if abs_z >= 4.0 else MAX_SPREAD_BASE
-    if spread > max_spread:
-        return None
+    if spread > _SPREAD_CAPS[(abs_z >= 4.0) + (abs_z >= 5.0)]:
+        return None, None
     volume = to_float(row.get("volume"), 0.0)
     if volume < MIN_VOLUME:
-        return None
-    # No regime filter for TREND — works in any regime
-    # TREND: enter WITH the move (opposite of FADE)
+        return None, None
+    # Move direction: +1 price going up, -1 going down, 0 unknown
     sig = to_upper(row.get("signal"))
     if sig == "SPIKE":
-        side = "BUY"       # Price going up → buy YES (follow momentum)
+        move = 1
     elif sig == "DIP":
-        side = "BUY_NO"    # Price going down → buy NO (follow momentum)
+        move = -1
     else:
         ds = to_float(row.get("direction_strength"))
         if math.isfinite(ds) and ds != 0:
-            side = "BUY" if ds > 0 else "BUY_NO"
+            move = 1 if ds > 0 else -1
         elif math.isfinite(delta) and delta != 0:
-            side = "BUY" if delta > 0 else "BUY_NO"
+            move = 1 if delta > 0 else -1
         else:
-            return None  # TREND needs clear direction
-    return slug, side, mid, abs_z
-
-def row_to_trend_from_outliers(row: Dict[str, str]) -> Optional[Tuple[str, str, float, float]]:
-    """Parse TREND signal from outliers CSV — follows momentum on strong moves."""
-    if not ENABLE_TREND:
-        return None
+            move = 0
+    fade = trend = None
+    if fade_ok:
+        regime = to_upper(row.get("regime"))
+        if not regime or regime == "MEAN_REVERT":
+            # FADE: enter AGAINST the move; with no direction, buy the cheaper side
+            if move:
+                side = "BUY_NO" if move > 0 else "BUY"
+            else:
+                side = "BUY" if mid < 0.5 else "BUY_NO"
+            fade = (slug, side, mid, abs_z, delta_pct)
+    # No regime filter for TREND — works in any regime, but needs a clear direction
+    if trend_ok and move:
+        trend = (slug, "BUY" if move > 0 else "BUY_NO", mid, abs_z, delta_pct)
+    return fade, trend
+
+def row_to_signals_from_outliers(row: Dict[str, str]) -> Tuple[Optional[Signal], Optional[Signal]]:
+    """Parse an outliers row into (FADE, TREND) candidates, running the shared quality gates once."""
     hint = to_upper(row.get("trade_hint"))
-    if hint not in ("FADE", "TREND"):
-        return None
+    fade_ok = hint == "FADE"
+    trend_ok = ENABLE_TREND and hint in ("FADE", "TREND")
+    if not (fade_ok or trend_ok):
+        return None, None
     z = to_float(row.get("z"))
     abs_z = abs(z) if math.isfinite(z) else to_float(row.get("abs_z"), 0.0)
-    if abs_z < TREND_Z_OPEN_OUTLIER:
-        return None
+    fade_ok = fade_ok and abs_z >= Z_OPEN_OUTLIER
+    trend_ok = trend_ok and abs_z >= TREND_Z_OPEN_OUTLIER
+    if not (fade_ok or trend_ok):
+        return None, None
     slug = (row.get("market_slug") or row.get("tid") or "").strip()
     if not slug:
-        return None
+        return None, None
     mid = to_float(row.get("mid"))
     if not (0 < mid < 1):
-        return None
+        return None, None
     delta = to_float(row.get("delta"), 0.0)
     delta_pct = abs(delta) / mid if mid > 0 else 0.0
     if delta_pct < MIN_DELTA_PCT or delta_pct > MAX_DELTA_PCT:
-        return None
+        return None, None
     spread = to_float(row.get("spread"), 0.0)
-    max_spread = MAX_SPREAD_HIGH if abs_z >= 5.0 else MAX_SPREAD_MID if abs_z >= 4.0 else MAX_SPREAD_BASE
-    if spread > max_spread:
-        return None
+    if spread > _SPREAD_CAPS[(abs_z >= 4.0) + (abs_z >= 5.0)]:
+        return None, None
     volume = to_float(row.get("volume"), 0.0)
     if volume < MIN_VOLUME:
-        return None
+        return None, None
+    up = math.isfinite(z) and z > 0
+    fade = trend = None
+    if fade_ok:
+        regime = to_upper(row.get("regime"))
+        if not regime or regime == "MEAN_REVERT":
+            fade = (slug, "BUY_NO" if up else "BUY", mid, abs_z, delta_pct)
     # TREND: enter WITH the move (z > 0 means spike up → BUY YES)
-    side = "BUY" if (math.isfinite(z) and z > 0) else "BUY_NO"
-    return slug, side, mid, abs_z
+    if trend_ok:
+        trend = (slug, "BUY" if up else "BUY_NO", mid, abs_z, delta_pct)
+    return fade, trend
 
 def extract_mid_from_row(row: Dict[str, str]) -> Optional[Tuple[str, float, float]]:
     slug = (row.get("market_slug") or row.get("tid") or "").strip()
@@ -2031,14 +2111,26 @@ def extract_mid_from_row(row: Dict[str, str]) -> Optional[Tuple[str, float, floa
     return slug, mid, ts
 
 def parse_csv_lines(header: List[str], lines: List[str]) -> List[Dict[str, str]]:
-    out = []
-    for ln in lines[-100:]:
-        if ln and "," in ln:
+    batch = [ln for ln in lines[-100:] if ln and "," in ln]
+    n = len(header)
+    try:
+        rows = list(csv.reader(batch))
+    except csv.Error:
+        rows = None
+    # A truncated line with an open quote makes the reader swallow the next
+    # line; fall back to per-line parsing so one bad row can't eat others.
+    if rows is None or len(rows) != len(batch):
+        rows = []
+        for ln in batch:
             try:
-                parts = list(csv.reader([ln]))[0]
-                out.append({h: parts[i] if i < len(parts) else "" for i, h in enumerate(header)})
+                rows.append(next(csv.reader([ln])))
             except Exception:
                 pass
+    out = []
+    for parts in rows:
+        if len(parts) < n:
+            parts += [""] * (n - len(parts))
+        out.append(dict(zip(header, parts)))
     return out
 
 def read_header(path: str) -> List[str]:
@@ -2050,6 +2142,35 @@ def read_header(path: str) -> List[str]:
 _cleanup_done = False
 _tailers: List[TailState] = []
 
+class CsvWatch:
+    """Sleep between main-loop passes, waking early when a tailed CSV is appended to.
+    Uses inotify when inotify_simple is installed, otherwise a plain sleep."""
+    def __init__(self, paths: List[str]):
+        self._ino = None
+        if not HAS_INOTIFY:
+            return
+        try:
+            self._ino = INotify()
+            for path in paths:
+                self._ino.add_watch(path, inotify_flags.MODIFY)
+        except OSError as e:
+            logger.warning(f"inotify unavailable, polling CSVs instead: {e}")
+            self.close()
+            return
+        atexit.register(self.close)
+
+    def wait(self, timeout_sec: float):
+        if self._ino is None:
+            time.sleep(timeout_sec)
+            return
+        self._ino.read(timeout=int(timeout_sec * 1000), read_delay=CSV_WAKE_COALESCE_MS)
+
+    def close(self):
+        if self._ino is not None:
+            try: self._ino.close()
+            except OSError: pass
+            self._ino = None
+
 def register_tailer(t: TailState):
     _tailers.append(t)
 
@@ -2104,6 +2225,8 @@ def main():
     register_tailer(t_trig)
     register_tailer(t_outl)
 
+    csv_watch = CsvWatch([TRIGGERS_CSV, OUTLIERS_CSV])
+
     hdr_trig = read_header(TRIGGERS_CSV)
     hdr_outl = read_header(OUTLIERS_CSV)
 
@@ -2134,12 +2257,22 @@ def main():
     signal.signal(signal.SIGINT, handle_sig)
     signal.signal(signal.SIGTERM, handle_sig)
 
+    # Startup objects (config, sessions, trackers) live for the whole run: keep them
+    # out of future collections, and let the per-pass row dicts go by refcount
+    gc.freeze()
+    gc.set_threshold(GC_GEN0_THRESHOLD, 20, 20)
+
+    last_full_pass = float("-inf")
     while not stop:
         try:
-            if PAPER:
-                broker.latest_mids = load_latest_mids(MIDS_JSON_PATH)
-            else:
-                broker.sync_balance()
+            # Valuation and exits keep the MAIN_LOOP_SLEEP_SEC cadence; an early
+            # CsvWatch wake in between only tails the CSVs and tries new opens
+            full_pass = now() - last_full_pass >= MAIN_LOOP_SLEEP_SEC
+            if full_pass:
+                if PAPER:
+                    broker.latest_mids = load_latest_mids(MIDS_JSON_PATH)
+                else:
+                    broker.sync_balance()
 
             new_trig = t_trig.read_new_lines()
             new_outl = t_outl.read_new_lines()
@@ -2153,19 +2286,18 @@ def main():
                         slug, mid, ts = parsed
                         broker.csv_mids[slug] = (mid, ts)
 
-            for tid in list(broker.positions):
+            pass_ts = now()  # one clock read for age/trailing decisions this pass
+            exit_tids = list(broker.positions) if full_pass else []
+            if exit_tids and hasattr(broker, 'prefetch_prices'):
+                broker.prefetch_prices(exit_tids)
+            for tid in exit_tids:
                 pos = broker.positions.get(tid)
                 if not pos:
                     continue
                 current = broker.get_current_yes_mid(pos)
                 if not (0 < current < 1):
                     continue
-                age = now() - pos.entry_ts
-                is_stale = getattr(broker, '_is_stale_mid', lambda p, c: False)(pos, current)
-                # Use executable price (bid/ask) for profit-taking to avoid TP on inflated mid
-                exec_price = broker.get_executable_exit_price(pos)
-                ep = get_exit_params(pos.strategy)
-                stag = f"[{pos.strategy}] " if pos.strategy != "FADE" else ""
+                age = pass_ts - pos.entry_ts
 
                 # CONVERGENCE: hold until game over, only emergency SL / max hold / game-over
                 if pos.strategy == "CONVERGENCE":
@@ -2203,6 +2335,12 @@ def main():
                         logger.info(f"[CONV-HOLD] {tid[:16]}... {pos.side} profit={profit_pct*100:.1f}% age={age:.0f}s mid={current:.4f}")
                     continue
 
+                is_stale = getattr(broker, '_is_stale_mid', lambda p, c: False)(pos, current)
+                # Use executable price (bid/ask) for profit-taking to avoid TP on inflated mid
+                exec_price = broker.get_executable_exit_price(pos)
+                ep = get_exit_params(pos.strategy)
+                stag = _STRATEGY_TAGS.get(pos.strategy, "")
+
                 if hit_take_profit(pos.side, pos.entry_mid, exec_price, ep["tp"]):
                     res = broker.close(tid, current, "tp")
                     if res:
@@ -2222,7 +2360,8 @@ def main():
                 if ENABLE_TRAILING_STOP and not is_stale:
                     should_trail, new_peak = check_trailing_stop(
                         pos, exec_price, is_stale=is_stale,
-                        activate_pct=ep["trail_activate"], stop_pct=ep["trail_stop"])
+                        activate_pct=ep["trail_activate"], stop_pct=ep["trail_stop"],
+                        now_ts=pass_ts)
                     pos.peak_profit_pct = new_peak
                     if new_peak >= ep["trail_activate"] and not pos.trailing_active:
                         pos.trailing_active = True
@@ -2261,6 +2400,9 @@ def main():
 
             def try_open(rows, src):
                 nonlocal last_open_ts
+                # Fresh read per pass: the exit pass above may have spent time on closes
+                ts = now()
+                parse_row = row_to_signals_from_triggers if src == "TRIG" else row_to_signals_from_outliers
                 for r in rows:
                     skips.signals_processed += 1
                     try:
@@ -2271,7 +2413,7 @@ def main():
                             signal_tracker.record(slug_raw, direction)
 
                         ts_epoch = to_float(r.get("ts_epoch"), 0)
-                        if ts_epoch > 0 and abs(time.time() - ts_epoch) > MAX_SIGNAL_AGE_SEC:
+                        if ts_epoch > 0 and abs(ts - ts_epoch) > MAX_SIGNAL_AGE_SEC:
                             skips.signal_stale += 1
                             continue
 
@@ -2283,31 +2425,23 @@ def main():
                         else:
                             strategy = "FADE"
 
-                        if strategy == "TREND":
-                            sig = row_to_trend_from_triggers(r) if src == "TRIG" else row_to_trend_from_outliers(r)
+                        fade_sig, trend_sig = parse_row(r)
+                        if strategy == "TREND" and trend_sig:
+                            sig = trend_sig
                             z_min = TREND_Z_OPEN
-                            if not sig:
-                                sig = row_to_signal_from_triggers(r) if src == "TRIG" else row_to_signal_from_outliers(r)
-                                strategy = "FADE"
-                                z_min = Z_OPEN
                         else:
-                            sig = row_to_signal_from_triggers(r) if src == "TRIG" else row_to_signal_from_outliers(r)
+                            sig = fade_sig
+                            strategy = "FADE"
                             z_min = Z_OPEN
 
                         if not sig:
                             continue
-                        tid, side, mid, z = sig
+                        tid, side, mid, z, delta_pct = sig
                         # BUY_NO only for FADE: BUY-side fades dips which are real game info, not noise
                         if FADE_NO_SIDE_ONLY and strategy == "FADE" and side in ("BUY", "BUY_LONG"):
                             skips.buy_side_blocked += 1
                             continue
-                        if BLOCK_PRE_GAME and game_phase == "PRE_GAME":
-                            skips.game_phase_blocked += 1
-                            continue
-                        if BLOCK_POST_GAME and game_phase == "POST_GAME":
-                            skips.game_phase_blocked += 1
-                            continue
-                        if not ALLOW_UNKNOWN_PHASE and game_phase == "UNKNOWN":
+                        if game_phase in _BLOCKED_PHASES:
                             skips.game_phase_blocked += 1
                             continue
                         # Polymarket score-based late-game close contest filter
@@ -2319,11 +2453,12 @@ def main():
                         if CIRCUIT_BREAKER_ENABLED and broker.realized_pnl <= DAILY_LOSS_LIMIT:
                             skips.circuit_breaker += 1
                             continue
-                        if broker.is_blocked(tid):
-                            if market_loss_tracker.is_blocked(tid):
-                                skips.market_loss_limit += 1
-                            else:
-                                skips.blocked_market += 1
+                        # Same test as broker.is_blocked, split so each hit costs one lookup
+                        if market_loss_tracker.is_blocked(tid):
+                            skips.market_loss_limit += 1
+                            continue
+                        if tid in MARKET_BLOCKLIST:
+                            skips.blocked_market += 1
                             continue
                         fade_trend_count = sum(1 for p in broker.positions.values() if p.strategy != "CONVERGENCE")
                         if fade_trend_count >= MAX_CONCURRENT_POS:
@@ -2338,7 +2473,7 @@ def main():
                         if rearm_tracker.is_trending_against(tid, mid, side):
                             skips.trending_reentry += 1
                             continue
-                        if time.time() - last_open_ts < MIN_OPEN_INTERVAL_SEC:
+                        if ts - last_open_ts < MIN_OPEN_INTERVAL_SEC:
                             skips.open_cooldown += 1
                             continue
                         if not broker.can_afford_trade():
@@ -2351,15 +2486,17 @@ def main():
                             skips.price_filter += 1
                             continue
                         pos = broker.open(tid, side, mid, z, strategy=strategy)
+                        # Live opens can block on fill polling, filled or not
+                        ts = now()
                         if pos:
                             last_open_ts = time.time()
                             rearm_tracker.touch(tid)
-                            stag = f"[{strategy}] " if strategy != "FADE" else ""
+                            stag = _STRATEGY_TAGS.get(strategy, "")
                             cluster_info = ""
                             if strategy == "TREND" and direction and slug_raw:
                                 sc, st, sr = signal_tracker.get_cluster_info(slug_raw, direction)
                                 cluster_info = f" cluster={sc}/{st}({sr*100:.0f}%)"
-                            print(f"🔵 [OPEN] {stag}{tid[:16]}... {side} mid={mid:.4f} z={z:.1f} delta_pct={abs(to_float(r.get('delta'),0))/max(mid,1e-9)*100:.1f}%{cluster_info}")
+                            print(f"🔵 [OPEN] {stag}{tid[:16]}... {side} mid={mid:.4f} z={z:.1f} delta_pct={delta_pct*100:.1f}%{cluster_info}")
                     except Exception as e:
                         logger.warning(f"Error processing {src} row: {e}")
                         skips.bad_row += 1
@@ -2396,6 +2533,9 @@ def main():
                     elif DEBUG_REJECTIONS:
                         logger.debug(f"[CONV-SKIP] {sig['slug'][:16]}... {reason}")
 
+            flush_trades()  # one write for all trades opened/closed this pass
+            sys.stdout.flush()  # likewise for this pass's console lines in the log file
+
             t = now()
             if t - last_cleanup >= CLEANUP_EVERY_SEC:
                 if hasattr(broker, 'cleanup_all'):
@@ -2403,7 +2543,6 @@ def main():
                 rearm_tracker.force_cleanup()
                 signal_tracker.cleanup()
                 conv_tracker.cleanup()
-                gc.collect()
                 last_cleanup = t
 
             if t - last_status >= STATUS_EVERY_SEC:
@@ -2417,7 +2556,7 @@ def main():
                 last_status = t
 
             if t - last_summary >= SUMMARY_EVERY_SEC and skips.has_any():
-                bits = [f"{k}:{v}" for k, v in skips.__dict__.items() if v and k != "signals_processed"]
+                bits = [f"{k}:{v}" for k, v in skips.items() if v and k != "signals_processed"]
                 sig_count = skips.signals_processed
                 summary_parts = [f"signals:{sig_count}"] if sig_count else []
                 summary_parts.extend(bits)
@@ -2426,7 +2565,9 @@ def main():
                 skips.clear()
                 last_summary = t
 
-            time.sleep(0.25)
+            if full_pass:
+                last_full_pass = now()
+            csv_watch.wait(max(0.0, last_full_pass + MAIN_LOOP_SLEEP_SEC - now()))
 
         except Exception as e:
             logger.error(f"Main loop error: {e}")